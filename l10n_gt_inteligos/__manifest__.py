@@ -17,12 +17,13 @@
                 'account_tax_python', 'account_check_printing', 'account_followup', 'base_vat', 'mail', 'sale'],
     'data': [
         'security/ir.model.access.csv',
-        'data/gt.county.csv',
+        'security/l10n_gt_inteligos_security.xml',
         'data/res.country.state.csv',
-        'data/gt.zone.csv',
+        'data/gt_territorial_data.xml',
         'data/l10n_latam.document.type.csv',
         'data/l10n_latam_identification_type_data.xml',
         'data/res_country_group_data.xml',
+        'data/ir_cron_data.xml',
         'views/account_journal.xml',
         'views/ir_sequence_view.xml',
         'views/account_move_view.xml',
@@ -36,6 +37,10 @@
         'views/region_menu.xml',
         'views/account_tax_views.xml',
         'views/gt_zone_views.xml',
+        'views/gt_nit_cache_views.xml',
+        'views/gt_region_recompute_views.xml',
+        'views/gt_payment_forecast_views.xml',
+        'views/gt_move_post_job_views.xml',
     ],
     'installable': True,
     'auto_install': False,
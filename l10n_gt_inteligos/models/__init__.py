@@ -7,11 +7,15 @@ from . import (
     res_company,
     res_partner,
     res_currency,
+    res_currency_rate,
     res_config_settings,
     account_journal,
     ir_sequence,
+    l10n_latam_document_type,
     sequence_mixin,
     # gt_territorial_division
+    gt_territorial_division,
+    gt_region_recompute,
     gt_region,
     gt_subregion,
     res_country_state,
@@ -22,4 +26,9 @@ from . import (
     gt_zone,
     template_gt,
     account_move_reversal,
+    gt_nit_cache,
+    account_account,
+    gt_payment_forecast,
+    account_partial_reconcile,
+    gt_move_post_job,
 )
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models
+
+# Tipos de cuenta de las cuentas predeterminadas de los contactos (res.partner._get_gt_default_account_id)
+GT_DEFAULT_ACCOUNT_TYPES = ('asset_receivable', 'liability_payable')
+
+
+class AccountAccountInherited(models.Model):
+    _inherit = 'account.account'
+
+    # Campos que afectan las cuentas predeterminadas de los contactos (res.partner._get_gt_default_account_id)
+    _GT_DEFAULT_ACCOUNT_FIELDS = {'code', 'deprecated', 'account_type', 'company_ids'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        accounts = super().create(vals_list)
+        if accounts._gt_affects_default_account():
+            self.env.registry.clear_cache()
+        return accounts
+
+    def write(self, vals):
+        if not self._GT_DEFAULT_ACCOUNT_FIELDS.intersection(vals):
+            return super().write(vals)
+        affected = self._gt_affects_default_account()
+        res = super().write(vals)
+        if affected or self._gt_affects_default_account():
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        affected = self._gt_affects_default_account()
+        res = super().unlink()
+        if affected:
+            self.env.registry.clear_cache()
+        return res
+
+    def _gt_affects_default_account(self):
+        """
+        Indica si alguna de las cuentas es, o podría pasar a ser, la cuenta predeterminada en caché de los contactos
+        de alguna de sus compañías: la cuenta predeterminada misma, o una cuenta vigente del mismo tipo con un código
+        menor o igual. Sólo en ese caso se invalida la caché del registro, ya que invalidarla descarta también el
+        resto de cachés del grupo en todos los workers.
+        :return: bool
+        """
+        partner_model = self.env['res.partner']
+        for account in self.sudo().filtered(lambda a: a.account_type in GT_DEFAULT_ACCOUNT_TYPES):
+            for company in account.company_ids:
+                default_id = partner_model._get_gt_default_account_id(company.id, account.account_type)
+                if account.id == default_id:
+                    return True
+                if account.deprecated:
+                    continue
+                default = account.browse(default_id).with_company(company)
+                if not default or (account.with_company(company).code or '') <= (default.code or ''):
+                    return True
+        return False
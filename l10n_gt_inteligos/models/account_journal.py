@@ -17,6 +17,33 @@ class AccountJournalInherited(models.Model):
              "credit note entries of this journal.",
         copy=False
     )
+    # changegt
+    gt_numbering_mode = fields.Selection(
+        selection=[('single', 'Serie única'), ('sharded', 'Series por subrangos')],
+        string='Modo de numeración', default='single', required=True,
+        help="Serie única: todos los documentos se numeran en la secuencia del diario, por lo que la publicación "
+             "concurrente espera por el bloqueo de la secuencia.\n"
+             "Series por subrangos: cada publicación toma un subrango libre de la secuencia, con su propia serie "
+             "sin saltos, por lo que varias publicaciones concurrentes no se bloquean entre sí."
+    )
+    gt_shard_count = fields.Integer(string='Cantidad de subrangos', default=4)
+
+    _sql_constraints = [
+        ('gt_shard_count_range', 'CHECK(gt_shard_count BETWEEN 1 AND 26)',
+         'La cantidad de subrangos debe estar entre 1 y 26.')
+    ]
+
+    def _gt_sync_shard_sequences(self):
+        """Crea o archiva los subrangos de las secuencias de los diarios con numeración por subrangos."""
+        for journal in self.filtered(lambda j: j.gt_numbering_mode == 'sharded'):
+            (journal.sequence_id | journal.refund_sequence_id).sudo()._gt_sync_shards(journal.gt_shard_count)
+
+    def _get_gt_default_document_type(self):
+        """Tipo de documento configurado en la secuencia principal del diario. Se lee con el ORM, cuya caché y
+            precarga resuelven los diarios y secuencias de todo el lote en una consulta por modelo, sin una caché
+            del registro que deba invalidarse en todos los workers al modificar diarios o secuencias."""
+        self.ensure_one()
+        return self.sudo().sequence_id.l10n_latam_document_type_id.with_env(self.env)
 
     @api.model
     def _create_sequence(self, vals, refund=False):
@@ -34,8 +61,8 @@ class AccountJournalInherited(models.Model):
             'number_increment': 1,
             'use_date_range': False,
             'journal_id': vals.get('id', False),
-            'l10n_latam_document_type_id': vals.get('doc_type_id', False) or self.env.ref(
-                'l10n_gt_inteligos.dc_fact').id
+            'l10n_latam_document_type_id': vals.get('doc_type_id', False) or self.env[
+                'l10n_latam.document.type']._get_gt_document_type('dc_fact').id
         }
         if 'company_id' in vals:
             seq['company_id'] = vals['company_id']
@@ -59,6 +86,7 @@ class AccountJournalInherited(models.Model):
                 if vals.get('type') == 'sale' and vals.get('refund_sequence') and not vals.get('refund_sequence_id'):
                     vals.update({'refund_sequence_id': self.sudo()._create_sequence(vals, refund=True).id})
         journal = super(AccountJournalInherited, self.with_context(mail_create_nolog=True)).create(vals_list)
+        journal._gt_sync_shard_sequences()
 
         return journal
 
@@ -83,8 +111,11 @@ class AccountJournalInherited(models.Model):
                         'company_id': journal.company_id.id,
                         'code': journal.code,
                         'id': journal.id,
-                        'doc_type_id': self.env.ref('l10n_gt_inteligos.dc_ncre').id
+                        'doc_type_id': self.env['l10n_latam.document.type']._get_gt_document_type('dc_ncre').id
                     }
                     journal.refund_sequence_id = self.sudo()._create_sequence(journal_vals, refund=True).id
 
+        if {'gt_numbering_mode', 'gt_shard_count', 'sequence_id', 'refund_sequence_id', 'refund_sequence'} & set(vals):
+            self._gt_sync_shard_sequences()
+
         return result
@@ -1,12 +1,31 @@
 # -*- coding: utf-8 -*-
 
+import logging
 from datetime import timedelta
-from num2words import num2words
 from collections import defaultdict
 from dateutil.relativedelta import relativedelta
 from odoo import (fields, api, models, _)
 from odoo.exceptions import (UserError, AccessError)
-from odoo.tools import (float_compare, format_date, get_lang, formatLang)
+from odoo.osv.expression import OR
+from odoo.tools import (create_index, float_compare, format_date, get_lang, formatLang)
+from odoo.tools.sql import column_exists, create_column
+from psycopg2.extras import execute_values
+
+from ..tools.amount_words import amount_to_words, amounts_to_words
+from ..tools.cron import CronBatchRunner
+from ..tools.nit import normalize_nit, normalize_nit_sql
+
+_logger = logging.getLogger(__name__)
+
+# Llave en env.cr.cache de las tasas de cambio resueltas por _get_invoice_currency_rates
+INVOICE_RATES_CACHE_KEY = 'l10n_gt_inteligos.invoice_rates'
+
+# Facturas de proveedor comparadas en _check_duplicate_supplier_reference
+# (sin alias de tabla, ya que también es la condición del índice parcial)
+SUPPLIER_REFERENCE_CONDITION = (
+    "move_type IN ('in_invoice', 'in_refund') AND state IN ('draft', 'posted') "
+    "AND invoice_doc_serie IS NOT NULL AND invoice_doc_number IS NOT NULL"
+)
 
 
 class AccountMoveInherited(models.Model):
@@ -17,8 +36,17 @@ class AccountMoveInherited(models.Model):
     # ----------------------------------------------------------
     #  Campos para busqueda por NIT y Razon Social en Contabilidad, Ventas y CRM
     nit = fields.Char(string="NIT")
-    legal_name = fields.Char(string="Razón Social")
-    amount_in_words = fields.Char(compute='compute_amount_word', string='Monto en letras facturas')
+    legal_name = fields.Char(string="Razón Social", index='trigram')
+    nit_normalized = fields.Char(
+        compute='_compute_nit_normalized', store=True, index=True,
+        string="NIT normalizado",
+        help='NIT sin guiones ni espacios y en mayúsculas, utilizado para las búsquedas por NIT.'
+    )
+    nit_search = fields.Char(
+        compute='_compute_nit_search', search='_search_nit_search',
+        string="NIT (búsqueda)"
+    )
+    amount_in_words = fields.Char(compute='compute_amount_word', store=True, string='Monto en letras facturas')
     print_to_report = fields.Boolean(string="Mostrar en reporte", default=True)
     name = fields.Char(tracking=3)
     ref = fields.Char(tracking=3)
@@ -36,17 +64,20 @@ class AccountMoveInherited(models.Model):
     credit_days = fields.Integer(store=True, compute='_compute_invoice_date', compute_sudo=False, string="Días crédito")
     invoice_doc_serie = fields.Char("Serie", copy=False)
     invoice_doc_number = fields.Char("Numero", copy=False)
-    invoice_ref = fields.Char(string="Referencia", compute="_set_reference")
+    invoice_ref = fields.Char(string="Referencia", compute="_set_reference", store=True)
 
     # Necesario para Coversion segun tasa de cambio
-    amount_total_signed_2 = fields.Monetary(string="Total segun Tasa de Cambio", readonly=True)
+    amount_total_signed_2 = fields.Monetary(
+        string="Total segun Tasa de Cambio", readonly=True, store=True,
+        compute='_compute_amount_total_signed_2', currency_field='company_currency_id'
+    )
     rate_invoice = fields.Float(string='Tasa de Cambio', readonly=True, digits=(1, 12), compute='_compute_rate_invoice')
     inverse_rate_invoice = fields.Float(string='Tasa de Cambio Inversa',
-                                        readonly=True, digits=(1, 6), compute='_compute_inverse_company_rate')
+                                        readonly=True, digits=(1, 6), compute='_compute_rate_invoice')
 
     # campo para calculo de fecha de pago segun configuracion de dias
-    payment_date = fields.Char(
-        compute='_compute_invoice_date', compute_sudo=False,
+    payment_date = fields.Date(
+        compute='_compute_invoice_date', compute_sudo=False, index=True,
         help='Aquí va la fecha de la entrega del pago del pedido de compra, '
              'de formma estandar se traslada al siguiente viernes de la fecha de confirmacion de la compra.',
         string="Fecha Entrega de Pago",
@@ -58,18 +89,13 @@ class AccountMoveInherited(models.Model):
     # ----------------------------------------------------------
     sub_region_id = fields.Many2one(
         comodel_name="gt.sub_region",
-        related='partner_id.state_id.sub_region_id',
-        depends=['partner_id.state_id',
-                 'partner_id.state_id.sub_region_id'],
+        compute='_compute_gt_regions',
         store=True,
         string="Sub-región"
     )
     region_id = fields.Many2one(
         comodel_name="gt.region",
-        related='partner_id.state_id.sub_region_id.region_id',
-        depends=['partner_id.state_id',
-                 'partner_id.state_id.sub_region_id',
-                 'sub_region_id'],
+        compute='_compute_gt_regions',
         store=True,
         string="Región"
     )
@@ -78,19 +104,116 @@ class AccountMoveInherited(models.Model):
     # l10n_gt_td_generic methods
     # ----------------------------------------------------------
 
+    def _auto_init(self):
+        """Creación y llenado por SQL de las columnas de campos almacenados nuevos o modificados (ej. nit_normalized)
+            para evitar su cálculo registro por registro a través del ORM al instalar o actualizar el módulo."""
+        if not column_exists(self.env.cr, self._table, 'nit_normalized'):
+            create_column(self.env.cr, self._table, 'nit_normalized', 'varchar')
+            self.env.cr.execute("UPDATE account_move SET nit_normalized = %s WHERE nit IS NOT NULL"
+                                % normalize_nit_sql('nit'))
+        # Columnas de campos almacenados que se llenan en segundo plano por _cron_backfill_amount_words
+        for column in ('amount_in_words', 'invoice_ref'):
+            if not column_exists(self.env.cr, self._table, column):
+                create_column(self.env.cr, self._table, column, 'varchar')
+        # payment_date se almacenaba como texto '%d/%m/%Y': conversión en sitio a fecha para no recalcularla
+        self.env.cr.execute("""
+            SELECT data_type FROM information_schema.columns
+             WHERE table_schema = current_schema() AND table_name = 'account_move' AND column_name = 'payment_date'
+        """)
+        row = self.env.cr.fetchone()
+        if row and row[0] != 'date':
+            self.env.cr.execute("""
+                ALTER TABLE account_move ALTER COLUMN payment_date TYPE date
+                USING to_date(NULLIF(payment_date, ''), 'DD/MM/YYYY')
+            """)
+        # Llenado en segundo plano por _cron_backfill_fx_amounts
+        if not column_exists(self.env.cr, self._table, 'amount_total_signed_2'):
+            create_column(self.env.cr, self._table, 'amount_total_signed_2', 'numeric')
+        return super()._auto_init()
+
+    def init(self):
+        super().init()
+        # Índice parcial que soporta la validación de referencias duplicadas en _check_duplicate_supplier_reference
+        create_index(self.env.cr, 'account_move_gt_supplier_reference_index', self._table,
+                     ['company_id', 'partner_id', 'invoice_doc_serie', 'invoice_doc_number'],
+                     where=SUPPLIER_REFERENCE_CONDITION)
+        # Índice de trigramas para la búsqueda por subcadena de NIT (_search_nit_search)
+        if self.env.registry.has_trigram:
+            create_index(self.env.cr, '%s_gt_nit_normalized_trgm_index' % self._table, self._table,
+                         ['nit_normalized gin_trgm_ops'], method='gin')
+
+    @api.model
+    def _cron_backfill_amount_words(self, batch_size=1000, time_limit=None):
+        """Acción planificada: calcula por lotes amount_in_words e invoice_ref de los documentos existentes
+            al momento de almacenar estos campos, confirmando cada lote, y luego amount_in_words de los pagos
+            existentes (account.payment._cron_backfill_amount_words) dentro del mismo plazo."""
+        count = 0
+
+        def step():
+            nonlocal count
+            self.env.cr.execute("""
+                SELECT id FROM account_move WHERE amount_in_words IS NULL ORDER BY id DESC LIMIT %s
+            """, [batch_size])
+            moves = self.browse(row[0] for row in self.env.cr.fetchall())
+            if not moves:
+                return False
+            for fname in ('amount_in_words', 'invoice_ref'):
+                self.env.add_to_compute(self._fields[fname], moves)
+            moves.flush_recordset(['amount_in_words', 'invoice_ref'])
+            count += len(moves)
+            self.env.invalidate_all()
+            return True
+
+        runner = CronBatchRunner(self.env, 'l10n_gt_inteligos.ir_cron_backfill_amount_words', time_limit)
+        done = runner.run(step)
+        if count:
+            _logger.info("Amount in words backfilled for %s journal entries", count)
+        if done:
+            self.env['account.payment']._cron_backfill_amount_words(batch_size=batch_size, runner=runner)
+
+    @api.depends('nit')
+    def _compute_nit_normalized(self):
+        for record in self:
+            record.nit_normalized = normalize_nit(record.nit) or False
+
+    @api.depends('nit')
+    def _compute_nit_search(self):
+        for record in self:
+            record.nit_search = record.nit
+
+    def _search_nit_search(self, operator, value):
+        """Búsqueda por NIT normalizando el valor ingresado para utilizar los índices de nit_normalized: igualdad,
+            subcadena (like/ilike, con el índice de trigramas) o patrón (=like/=ilike). nit_normalized está en
+            mayúsculas, por lo que las búsquedas no distinguen mayúsculas."""
+        if operator in ('=', 'like', 'ilike', '=like', '=ilike') and value and isinstance(value, str):
+            nit = normalize_nit(value)
+            if operator in ('like', 'ilike'):
+                return [('nit_normalized', 'like', nit)]
+            return [('nit_normalized', '=' if operator == '=' else '=like', nit)]
+        return [('nit', operator, value)]
+
+    @api.model
+    def _search_display_name(self, operator, value):
+        """Extensión de la búsqueda por nombre para incluir el NIT normalizado y la razón social."""
+        domain = super()._search_display_name(operator, value)
+        if operator in ('like', 'ilike', '=like', '=ilike', '=') and value and isinstance(value, str):
+            domain = OR([domain, self._search_nit_search(operator, value), [('legal_name', 'ilike', value)]])
+        return domain
+
     @api.depends('l10n_latam_available_document_type_ids')
     def _compute_l10n_latam_document_type(self):
         """
             Override to default the document configured in the sequence
             from the journal, if it is available in the document types
         """
+        fesp = self.env['l10n_latam.document.type']._get_gt_document_type('dc_fesp')
         for rec in self.filtered(lambda x: x.state == 'draft' and (
                 not x.posted_before if x.move_type in ['out_invoice', 'out_refund'] else True)):
             document_types = rec.l10n_latam_available_document_type_ids._origin
-            sequence_document_type = rec.journal_id.sequence_id.l10n_latam_document_type_id \
-                if rec.journal_id.sequence_id else False
+            sequence_document_type = rec.journal_id._origin._get_gt_default_document_type() \
+                if rec.journal_id._origin else False
             if sequence_document_type and sequence_document_type in document_types:
-                if self.l10n_latam_document_type_id == self.env.ref('l10n_gt_inteligos.dc_fesp'):
+                if rec.l10n_latam_document_type_id == fesp:
                     pass
                 else:
                     rec.l10n_latam_document_type_id = sequence_document_type
@@ -98,6 +221,14 @@ class AccountMoveInherited(models.Model):
                 rec.l10n_latam_document_type_id = (rec.company_id.l10n_latam_document_type_id
                                                    or document_types and document_types[0].id)
 
+    # Los cambios en la jerarquía territorial se actualizan en segundo plano mediante gt.region.recompute
+    @api.depends('partner_id.state_id')
+    def _compute_gt_regions(self):
+        territorial_division = self.env['gt.territorial.division']
+        for record in self:
+            record.sub_region_id, record.region_id = territorial_division._get_state_regions(
+                record.partner_id.state_id.id)
+
     def _is_manual_document_number(self):
         """  Avoid manually entering the document number on the supplier invoice """
         return False
@@ -112,53 +243,22 @@ class AccountMoveInherited(models.Model):
         :param lang: str value to localization
         :return: str amount in words
         """
-        list_lang = [['en', 'en_US'], ['en', 'en_AU'], ['en', 'en_GB'], ['en', 'en_IN'],
-                     ['fr', 'fr_BE'], ['fr', 'fr_CA'], ['fr', 'fr_CH'], ['fr', 'fr_FR'],
-                     ['es', 'es_ES'], ['es', 'es_AR'], ['es', 'es_BO'], ['es', 'es_CL'], ['es', 'es_CO'],
-                     ['es', 'es_CR'], ['es', 'es_DO'],
-                     ['es', 'es_EC'], ['es', 'es_GT'], ['es', 'es_MX'], ['es', 'es_PA'], ['es', 'es_PE'],
-                     ['es', 'es_PY'], ['es', 'es_UY'], ['es', 'es_VE'],
-                     ['lt', 'lt_LT'], ['lv', 'lv_LV'], ['no', 'nb_NO'], ['pl', 'pl_PL'], ['ru', 'ru_RU'],
-                     ['dk', 'da_DK'], ['pt_BR', 'pt_BR'], ['de', 'de_DE'], ['de', 'de_CH'],
-                     ['ar', 'ar_SY'], ['it', 'it_IT'], ['he', 'he_IL'], ['id', 'id_ID'], ['tr', 'tr_TR'],
-                     ['nl', 'nl_NL'], ['nl', 'nl_BE'], ['uk', 'uk_UA'], ['sl', 'sl_SI'], ['vi_VN', 'vi_VN']]
-
-        #     ['th','th_TH'],['cz','cs_CZ']
-        cnt = 0
-        for rec in list_lang[cnt:len(list_lang)]:
-            if rec[1] == lang:
-                language = rec[0]
-            cnt += 1
-
-        amount_str = str('{:2f}'.format(amount))
-        amount_str_splt = amount_str.split('.')
-        before_point_value = amount_str_splt[0]
-        after_point_value = amount_str_splt[1][:2]
-
-        before_amount_words = num2words(int(before_point_value), lang=language)
-        after_amount_words = num2words(int(after_point_value), lang=language)
-
-        amount = before_amount_words
-
-        if currency and currency.currency_unit_label:
-            amount += ' ' + currency.currency_unit_label
-
-        if currency and currency.amount_separator:
-            amount += ' ' + currency.amount_separator
-
-        if int(after_point_value) > 0:
-            amount += ' con ' + str(after_point_value) + '/100.'
-        else:
-            amount += ' exactos.'
-
-        return amount
-
-    @api.depends('amount_total')
+        return amount_to_words(
+            amount, language,
+            currency.currency_unit_label if currency else None,
+            currency.amount_separator if currency else None,
+            lang,
+        )
+
+    @api.depends('amount_total', 'currency_id.currency_unit_label', 'currency_id.amount_separator', 'partner_id.lang')
     def compute_amount_word(self):
-        """Método para manejar la conversión a letras de un monto de pago."""
-        for record in self:
-            amount = record.convert_amount_in_words(record.amount_total, 'es',
-                                                    record.currency_id, record.partner_id.lang)
+        """Método para manejar la conversión a letras de un monto, en una sola llamada para todos los registros."""
+        words = amounts_to_words([
+            (record.amount_total, record.currency_id.currency_unit_label, record.currency_id.amount_separator,
+             record.partner_id.lang)
+            for record in self
+        ])
+        for record, amount in zip(self, words):
             record.amount_in_words = amount.capitalize()
 
     # campo para calculo de fecha de pago segun configuracion de dias
@@ -172,22 +272,21 @@ class AccountMoveInherited(models.Model):
         Reducción de código y mejora en la legibilidad del mismo.
         Aparte solución a fallo al no ingresar una fecha de factura de forma manual,
         ya que esto impedia calcular los dias credito y la fecha de pago.
+        La fecha de pago es el siguiente día de pago (res.company.payment_day) de la compañía del documento,
+        calculada por lotes agrupando por compañía.
         :return:
         """
-        for record in self:
-            # changegt
-            if record.country_code == 'GT':
-                day = record.invoice_date or fields.Date.today()
+        # changegt
+        gt_moves = self.filtered(lambda m: m.country_code == 'GT')
+        (self - gt_moves).update({'credit_days': 0, 'payment_date': False})
+        today = fields.Date.today()
+        for company, moves in gt_moves.grouped('company_id').items():
+            payment_day = company.payment_day or 4
+            for record in moves:
+                day = record.invoice_date or today
                 record.credit_days = (record.invoice_date_due - day).days if record.invoice_date_due else 0
-                payment_day = record.env.company.payment_day or 4
-                if payment_day - day.weekday() <= 0:
-                    date = day - timedelta(days=day.weekday()) + timedelta(days=payment_day, weeks=1)
-                else:
-                    date = day - timedelta(days=day.weekday()) + timedelta(days=payment_day)
-                record.payment_date = date.strftime("%d/%m/%Y")
-            else:
-                record.credit_days = 0
-                record.payment_date = False
+                weeks = 1 if payment_day - day.weekday() <= 0 else 0
+                record.payment_date = day - timedelta(days=day.weekday()) + timedelta(days=payment_day, weeks=weeks)
 
     @api.onchange('partner_id')
     def _onchange_partner_id(self):
@@ -225,11 +324,12 @@ class AccountMoveInherited(models.Model):
                 """
         # changegt
         if self.env.company.account_fiscal_country_id.code == 'GT':
-
+            today = fields.Date.context_today(self)
+            recompute_ids = []
             for move in self:
                 if not move.invoice_date:
                     if not move.date:
-                        move.date = fields.Date.context_today(self)
+                        move.date = today
                     continue
                 accounting_date = move.invoice_date
                 if not move.is_sale_document(include_receipts=True):
@@ -243,15 +343,18 @@ class AccountMoveInherited(models.Model):
                         move.date = move.invoice_date if move.invoice_date else accounting_date
                     else:
                         move.date = accounting_date
-                    # _affect_tax_report may trigger premature recompute of line_ids.date
-                    self.env.add_to_compute(move.line_ids._fields['date'], move.line_ids)
-                    # might be protected because `_get_accounting_date` requires the `name`
-                    self.env.add_to_compute(self._fields['name'], move)
+                    recompute_ids.append(move.id)
                 elif (move.move_type in ('in_invoice', 'in_refund') and (res_months < 0 or res_months > 2)
                       and (str(move.l10n_latam_document_type_id.doc_code_prefix).strip() != "RECI")):
                     raise UserError('Sólo es posible tener una diferencia '
                                     'de 2 meses entre la fecha contable y la fecha de la factura.'
                                     'La fecha de la factura núnca puede ser mayor a la fecha contable.')
+            if recompute_ids:
+                moves = self.browse(recompute_ids)
+                # _affect_tax_report may trigger premature recompute of line_ids.date
+                self.env.add_to_compute(moves.line_ids._fields['date'], moves.line_ids)
+                # might be protected because `_get_accounting_date` requires the `name`
+                self.env.add_to_compute(self._fields['name'], moves)
         else:
             super()._compute_date()
 
@@ -260,62 +363,260 @@ class AccountMoveInherited(models.Model):
             ´invoice_date´ y ´date´. Si no hay valores en dichos campos, colocar la fecha de hoy, en otro caso,
             colocar el valor del campo ´date´ o ´invoice_date´ en ese orden.
         """
-        # changegt
-        if self.country_code == 'GT':
-            self.invoice_date = fields.Date.context_today(self) \
-                if not self.invoice_date and not self.date else self.invoice_date or self.date
-            self._compute_date()
+        # changegt: una escritura por fecha de documento para todo el lote
+        gt_moves = self.filtered(lambda move: move.country_code == 'GT')
+        if gt_moves:
+            today = fields.Date.context_today(self)
+            moves_by_date = defaultdict(list)
+            for move in gt_moves:
+                invoice_date = move.invoice_date or move.date or today
+                if invoice_date != move.invoice_date:
+                    moves_by_date[invoice_date].append(move.id)
+            for invoice_date, move_ids in moves_by_date.items():
+                self.browse(move_ids).invoice_date = invoice_date
+            gt_moves._compute_date()
         return super(AccountMoveInherited, self).action_post()
 
-    @api.model
-    @api.depends('currency_id')
+    def action_gt_post_in_background(self):
+        """Acción para publicar en segundo plano, por bloques, los documentos en borrador seleccionados."""
+        job = self.env['gt.move.post.job']._enqueue(self)
+        if not job:
+            raise UserError(_("No hay documentos en borrador entre los seleccionados."))
+        return {
+            'type': 'ir.actions.act_window',
+            'name': _("Publicación masiva"),
+            'res_model': 'gt.move.post.job',
+            'res_id': job.id,
+            'view_mode': 'form',
+            'target': 'current',
+        }
+
+    def _get_invoice_currency_rates(self):
+        """
+        Resuelve en una sola consulta las tasas de cambio a la fecha de factura de la moneda del documento y de
+        la moneda de la compañía. Como en res.currency._get_rates, sólo se consideran las tasas de la compañía del
+        documento y de sus compañías principales (primero la más cercana) y luego las tasas sin compañía.
+        Los resultados se guardan en la caché del cursor, por lo que se comparten entre ambos campos de tasa y
+        durante toda la transacción; se invalida al modificar res.currency.rate y al confirmar o revertir la
+        transacción, ya que el cursor se reutiliza entre transacciones (acciones planificadas por lotes).
+        :return: dict {(currency_id, company_id, invoice_date): (id de res.currency.rate o None,
+            bool la moneda tiene tasas registradas)}
+        """
+        cr = self.env.cr
+        cache = cr.cache.get(INVOICE_RATES_CACHE_KEY)
+        if cache is None:
+            cache = cr.cache[INVOICE_RATES_CACHE_KEY] = {}
+            cr.postcommit.add(lambda: cr.cache.pop(INVOICE_RATES_CACHE_KEY, None))
+            cr.postrollback.add(lambda: cr.cache.pop(INVOICE_RATES_CACHE_KEY, None))
+        keys = set()
+        for move in self:
+            keys.add((move.currency_id.id, move.company_id.id, move.invoice_date or None))
+            keys.add((move.company_id.currency_id.id, move.company_id.id, move.invoice_date or None))
+        missing = [key for key in keys if key[0] and key not in cache]
+        if missing:
+            self.env['res.currency.rate'].flush_model(['currency_id', 'company_id', 'name'])
+            self.env.cr.execute("""
+                SELECT key.currency_id, key.company_id, key.date,
+                       (SELECT rate.id
+                          FROM res_currency_rate rate
+                         WHERE rate.currency_id = key.currency_id
+                           AND rate.name = key.date
+                           AND (rate.company_id = ANY(company.parent_ids) OR rate.company_id IS NULL)
+                      ORDER BY array_position(company.parent_ids, rate.company_id) DESC NULLS LAST, rate.id
+                         LIMIT 1),
+                       EXISTS(SELECT 1
+                                FROM res_currency_rate rate
+                               WHERE rate.currency_id = key.currency_id
+                                 AND (rate.company_id = ANY(company.parent_ids) OR rate.company_id IS NULL))
+                  FROM unnest(%s::int[], %s::int[], %s::date[]) AS key(currency_id, company_id, date)
+                  JOIN LATERAL (SELECT string_to_array(rtrim(parent_path, '/'), '/')::int[] AS parent_ids
+                                  FROM res_company
+                                 WHERE id = key.company_id) company ON TRUE
+            """, [[key[0] for key in missing], [key[1] for key in missing], [key[2] for key in missing]])
+            for currency_id, company_id, date, rate_id, has_rates in self.env.cr.fetchall():
+                cache[(currency_id, company_id, date)] = (rate_id, has_rates)
+        return cache
+
+    @api.depends('currency_id', 'company_id', 'invoice_date', 'country_code')
     def _compute_rate_invoice(self):
-        for record in self:
-            # changegt
-            if record.country_code == 'GT':
-
-                rate_invoice = [r['company_rate'] for r in record['currency_id']['rate_ids']
-                                if record['invoice_date'] == r['name']]
-                if rate_invoice:
-                    record.rate_invoice = rate_invoice[0]
-                elif record['company_id']['currency_id']['rate_ids']:
-                    rate_invoice = [r['company_rate'] for r in record['company_id']['currency_id']['rate_ids']
-                                    if record['invoice_date'] == r['name']]
-                    if rate_invoice:
-                        record.rate_invoice = rate_invoice[0]
-                    else:
-                        record.rate_invoice = record['company_id']['currency_id']['rate']
+        """Cálculo compartido de rate_invoice e inverse_rate_invoice, con la tasa a la fecha de factura."""
+        # changegt
+        gt_moves = self.filtered(lambda m: m.country_code == 'GT')
+        (self - gt_moves).update({'rate_invoice': 0.0, 'inverse_rate_invoice': 0.0})
+        if not gt_moves:
+            return
+        rates = gt_moves._get_invoice_currency_rates()
+        rate_records = self.env['res.currency.rate'].browse(
+            {rate_id for rate_id, _has_rates in rates.values() if rate_id})
+        rate_by_id = {rate.id: rate for rate in rate_records}
+
+        for record in gt_moves:
+            company_currency = record.company_id.currency_id
+            date = record.invoice_date or None
+            rate_id, _has_rates = rates.get((record.currency_id.id, record.company_id.id, date), (None, False))
+            if not rate_id:
+                company_rate_id, company_has_rates = rates.get(
+                    (company_currency.id, record.company_id.id, date), (None, False))
+                if company_has_rates:
+                    rate_id = company_rate_id
+                    fallback = company_currency
                 else:
-                    record.rate_invoice = record['currency_id']['rate']
+                    fallback = record.currency_id
+            if rate_id:
+                rate = rate_by_id[rate_id]
+                record.rate_invoice = rate.company_rate
+                record.inverse_rate_invoice = rate.inverse_company_rate
             else:
-                record.rate_invoice = 0.0
+                record.rate_invoice = fallback.rate
+                record.inverse_rate_invoice = fallback.inverse_rate
 
-    # Necesario para Coversion segun tasa de cambio
+    @api.depends('amount_total_in_currency_signed', 'currency_id', 'company_id', 'invoice_date')
+    def _compute_amount_total_signed_2(self):
+        for move in self:
+            move.amount_total_signed_2 = move.amount_total_in_currency_signed * move.inverse_rate_invoice
 
     @api.model
-    @api.depends('currency_id')
-    def _compute_inverse_company_rate(self):
-        for record in self:
-            # changegt
-            if record.country_code == 'GT':
-
-                inverse_rate_invoice = [r['inverse_company_rate'] for r in record['currency_id']['rate_ids']
-                                        if record['invoice_date'] == r['name']]
-                if inverse_rate_invoice:
-                    record.inverse_rate_invoice = inverse_rate_invoice[0]
-                elif record['company_id']['currency_id']['rate_ids']:
-                    inverse_rate_invoice = [r['inverse_company_rate'] for r in
-                                            record['company_id']['currency_id']['rate_ids']
-                                            if record['invoice_date'] == r['name']]
-                    if inverse_rate_invoice:
-                        record.inverse_rate_invoice = inverse_rate_invoice[0]
-                    else:
-                        record.inverse_rate_invoice = record['company_id']['currency_id']['inverse_rate']
-                else:
-                    record.inverse_rate_invoice = record['currency_id']['inverse_rate']
-            else:
-                record.inverse_rate_invoice = 0.0
+    def _update_fx_amounts(self, groups):
+        """
+        Motor de conversión por SQL de amount_total_signed_2 y price_subtotal_signed_2: una multiplicación por
+        grupo (compañía, moneda, fecha de factura) sobre todos los documentos y líneas del grupo, en lugar del
+        cálculo registro por registro del ORM. Se utiliza desde la acción planificada, para las tasas de cambio
+        modificadas y en la carga histórica.
+        :param groups: iterable of tuple (company_id, currency_id, invoice_date o None)
+        :return: int cantidad de documentos actualizados
+        """
+        groups = list(set(groups))
+        if not groups:
+            return 0
+        self.flush_model(['amount_total_in_currency_signed', 'currency_id', 'company_id', 'invoice_date',
+                          'move_type', 'amount_total_signed_2'])
+        self.env['account.move.line'].flush_model(['price_subtotal', 'move_id', 'price_subtotal_signed_2'])
+
+        # Un documento representativo por grupo para obtener la tasa con el mismo cálculo de inverse_rate_invoice
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (move.company_id, move.currency_id, move.invoice_date) move.id
+              FROM account_move move
+              JOIN unnest(%s::int[], %s::int[], %s::date[]) AS grp(company_id, currency_id, date)
+                ON move.company_id = grp.company_id
+               AND move.currency_id = grp.currency_id
+               AND move.invoice_date IS NOT DISTINCT FROM grp.date
+        """, [[group[0] for group in groups], [group[1] for group in groups], [group[2] for group in groups]])
+        representatives = self.browse(row[0] for row in self.env.cr.fetchall())
+        # La tasa no almacenada puede estar en caché con un valor previo a un cambio de tasas en la transacción
+        representatives.invalidate_recordset(['rate_invoice', 'inverse_rate_invoice'])
+        values = {False: [], True: []}
+        for move in representatives:
+            values[bool(move.invoice_date)].append((
+                move.company_id.id, move.currency_id.id, move.invoice_date or None,
+                move.inverse_rate_invoice, move.company_id.currency_id.decimal_places,
+            ))
+
+        updated = 0
+        for dated, rows in values.items():
+            if not rows:
+                continue
+            # Los grupos sin fecha de factura se procesan aparte para utilizar el índice de invoice_date
+            date_condition = 'move.invoice_date = grp.date' if dated else 'move.invoice_date IS NULL'
+            execute_values(self.env.cr._obj, """
+                UPDATE account_move move
+                   SET amount_total_signed_2 = ROUND(COALESCE(move.amount_total_in_currency_signed, 0) * grp.rate,
+                                                     grp.decimal_places)
+                  FROM (VALUES %%s) AS grp(company_id, currency_id, date, rate, decimal_places)
+                 WHERE move.company_id = grp.company_id
+                   AND move.currency_id = grp.currency_id
+                   AND %(date_condition)s
+                   AND move.amount_total_signed_2 IS DISTINCT FROM
+                       ROUND(COALESCE(move.amount_total_in_currency_signed, 0) * grp.rate, grp.decimal_places)
+            """ % {'date_condition': date_condition}, rows,
+                template='(%s::int, %s::int, %s::date, %s::numeric, %s::int)', page_size=len(rows))
+            updated += self.env.cr.rowcount
+            execute_values(self.env.cr._obj, """
+                UPDATE account_move_line line
+                   SET price_subtotal_signed_2 = ROUND(
+                           COALESCE(line.price_subtotal, 0) * grp.rate
+                           * CASE WHEN move.move_type IN ('in_invoice', 'out_refund', 'in_receipt') THEN -1 ELSE 1 END,
+                           grp.decimal_places)
+                  FROM account_move move,
+                       (VALUES %%s) AS grp(company_id, currency_id, date, rate, decimal_places)
+                 WHERE line.move_id = move.id
+                   AND move.company_id = grp.company_id
+                   AND move.currency_id = grp.currency_id
+                   AND %(date_condition)s
+                   AND line.price_subtotal_signed_2 IS DISTINCT FROM ROUND(
+                           COALESCE(line.price_subtotal, 0) * grp.rate
+                           * CASE WHEN move.move_type IN ('in_invoice', 'out_refund', 'in_receipt') THEN -1 ELSE 1 END,
+                           grp.decimal_places)
+            """ % {'date_condition': date_condition}, rows,
+                template='(%s::int, %s::int, %s::date, %s::numeric, %s::int)', page_size=len(rows))
+
+        self.invalidate_model(['amount_total_signed_2'])
+        self.env['account.move.line'].invalidate_model(['price_subtotal_signed_2'])
+        return updated
+
+    @api.model
+    def _update_fx_amounts_for_rates(self, currency_dates):
+        """
+        Actualiza los montos según tasa de cambio de los documentos afectados por cambios en tasas de cambio:
+        los documentos en la moneda de la tasa y los de compañías cuya moneda es la de la tasa, que la utilizan
+        cuando la moneda del documento no tiene tasa a la fecha de factura (ver _compute_rate_invoice).
+        :param currency_dates: iterable of tuple (currency_id, fecha de la tasa)
+        :return: int cantidad de documentos actualizados
+        """
+        currency_dates = list(set(currency_dates))
+        if not currency_dates:
+            return 0
+        self.flush_model(['currency_id', 'company_id', 'invoice_date'])
+        self.env.cr.execute("""
+            SELECT DISTINCT move.company_id, move.currency_id, move.invoice_date
+              FROM account_move move
+              JOIN res_company company ON company.id = move.company_id
+              JOIN unnest(%s::int[], %s::date[]) AS rate(currency_id, date)
+                ON move.invoice_date = rate.date
+               AND (move.currency_id = rate.currency_id OR company.currency_id = rate.currency_id)
+        """, [[key[0] for key in currency_dates], [key[1] for key in currency_dates]])
+        return self._update_fx_amounts(self.env.cr.fetchall())
 
+    @api.model
+    def _cron_backfill_fx_amounts(self, batch_size=200, rate_batch_size=10, time_limit=None):
+        """Acción planificada: aplica las tasas de cambio modificadas (gt.fx.rate.queue) y luego realiza la carga
+            histórica de amount_total_signed_2 y price_subtotal_signed_2 por grupos de (compañía, moneda, fecha de
+            factura), confirmando cada lote."""
+        count = 0
+
+        def step():
+            nonlocal count
+            currency_dates = self.env['gt.fx.rate.queue']._pop(rate_batch_size)
+            if currency_dates:
+                count += self._update_fx_amounts_for_rates(currency_dates)
+                self.env.invalidate_all()
+                return True
+            self.env.cr.execute("""
+                SELECT DISTINCT company_id, currency_id, invoice_date
+                  FROM account_move
+                 WHERE amount_total_signed_2 IS NULL
+                 LIMIT %s
+            """, [batch_size])
+            groups = self.env.cr.fetchall()
+            if not groups:
+                self.env.cr.execute("""
+                    SELECT DISTINCT move.company_id, move.currency_id, move.invoice_date
+                      FROM account_move_line line
+                      JOIN account_move move ON move.id = line.move_id
+                     WHERE line.price_subtotal_signed_2 IS NULL
+                     LIMIT %s
+                """, [batch_size])
+                groups = self.env.cr.fetchall()
+            if not groups:
+                return False
+            count += self._update_fx_amounts(groups)
+            self.env.invalidate_all()
+            return True
+
+        CronBatchRunner(self.env, 'l10n_gt_inteligos.ir_cron_backfill_fx_amounts', time_limit).run(step)
+        if count:
+            _logger.info("Amounts by exchange rate backfilled for %s journal entries", count)
+
+    @api.depends('country_code', 'l10n_latam_document_type_id.name', 'invoice_doc_serie', 'invoice_doc_number')
     def _set_reference(self):
         for rec in self:
             # changegt
@@ -347,19 +648,79 @@ class AccountMoveInherited(models.Model):
     def set_values_by_sequence(self, sequence):
         """
         Método para obtener y asignar los datos desde la secuencia activa según el diario enlazado a ´self´.
+        Se conserva por compatibilidad; la asignación se realiza por lotes en _assign_values_by_sequence.
         :param sequence: registro del tipo ir.sequence que hace referencia a la secuencia del diario enlazado a ´self´.
         :return: None
         """
-        if self.move_type in ['out_invoice', 'out_refund'] or sequence.l10n_latam_document_type_id == self.env.ref(
-                'l10n_gt_inteligos.dc_fesp'):
-            to_write = {
-                'l10n_latam_document_type_id': sequence.l10n_latam_document_type_id,
-                'invoice_doc_serie': sequence._get_prefix_suffix(date=self.invoice_date or fields.Date.today(),
-                                                                 date_range=self.invoice_date)[0],
-                'invoice_doc_number': '%%0%sd' % sequence.padding % sequence._get_current_sequence().number_next_actual,
-                'name': sequence.next_by_id(sequence_date=self.date)
-            }
-            self.write(to_write)
+        self._assign_values_by_sequence(sequence)
+
+    def _assign_values_by_sequence(self, sequence=None):
+        """
+        Numeración por lotes de los documentos: se reserva un bloque de números consecutivos por
+        (secuencia, rango de fechas) y se asignan tipo de documento, serie, número y nombre a todos los
+        documentos con una sola actualización. En diarios con numeración por subrangos se numera en el
+        subrango tomado por la transacción (ir.sequence._gt_pick_shard).
+        :param sequence: ir.sequence a utilizar en todos los documentos; por defecto la secuencia del diario
+            de cada documento (_get_sequence)
+        :return: None
+        """
+        fesp = self.env['l10n_latam.document.type']._get_gt_document_type('dc_fesp')
+        today = fields.Date.today()
+        groups = defaultdict(list)
+        date_ranges = {}
+        shards = {}
+        for move in self:
+            move_sequence = sequence or move._get_sequence()
+            if not move_sequence:
+                raise UserError(_('Please define a sequence on your journal.'))
+            if move.journal_id.gt_numbering_mode == 'sharded':
+                # Un subrango libre por secuencia y transacción, con su propia serie
+                if move_sequence not in shards:
+                    shards[move_sequence] = move_sequence.sudo()._gt_pick_shard().with_env(move_sequence.env)
+                move_sequence = shards[move_sequence]
+            if move.move_type in ['out_invoice', 'out_refund'] or move_sequence.l10n_latam_document_type_id == fesp:
+                # Un bloque por secuencia y rango de fechas de la secuencia
+                if (move_sequence, move.date) not in date_ranges:
+                    date_ranges[(move_sequence, move.date)] = move_sequence._get_current_sequence(
+                        sequence_date=move.date) if move_sequence.use_date_range else None
+                groups[(move_sequence, date_ranges[(move_sequence, move.date)])].append(move)
+        if not groups:
+            return
+
+        rows = []
+        series = {}
+        for (move_sequence, _date_range), moves in groups.items():
+            numbers = move_sequence._next_block_by_id(len(moves), sequence_date=moves[0].date)
+            number_format = '%%0%sd' % move_sequence.padding
+            for move, (number, name) in zip(moves, numbers):
+                serie_key = (move_sequence, move.invoice_date)
+                if serie_key not in series:
+                    series[serie_key] = move_sequence._get_prefix_suffix(
+                        date=move.invoice_date or today, date_range=move.invoice_date)[0]
+                rows.append((move.id, move_sequence.l10n_latam_document_type_id.id or None,
+                             series[serie_key], number_format % number, name, self.env.uid, self.env.cr.now()))
+
+        fnames = ['l10n_latam_document_type_id', 'invoice_doc_serie', 'invoice_doc_number', 'name']
+        moves = self.browse(row[0] for row in rows)
+        moves.flush_recordset()
+        if not self.env.context.get('tracking_disable') and not self.env.context.get('mail_notrack'):
+            moves._track_prepare(fnames)
+        execute_values(self.env.cr._obj, """
+            UPDATE account_move move
+               SET l10n_latam_document_type_id = data.document_type_id,
+                   invoice_doc_serie = data.serie,
+                   invoice_doc_number = data.number,
+                   name = data.name,
+                   write_uid = data.write_uid,
+                   write_date = data.write_date
+              FROM (VALUES %s) AS data(id, document_type_id, serie, number, name, write_uid, write_date)
+             WHERE move.id = data.id
+        """, rows, template='(%s::int, %s::int, %s::varchar, %s::varchar, %s::varchar, %s::int, %s::timestamp)',
+            page_size=1000)
+        moves.invalidate_recordset(fnames + ['write_uid', 'write_date'])
+        # Campos dependientes (ej. sequence_prefix, invoice_ref) y restricciones, como en write
+        moves.modified(fnames)
+        moves._validate_fields(fnames)
 
     def _post(self, soft=True):
         """Post/Validate the documents.
@@ -501,14 +862,11 @@ class AccountMoveInherited(models.Model):
                 subscribers = [partner_id.id] if partner_id and partner_id not in invoice.sudo().message_partner_ids else None
                 invoice.message_subscribe(subscribers)
 
-                """Adición Inteligos al método genérico, cambiar esta sección durante la migración entre
-                                versiones de Odoo"""
-                # Get the journal's sequence.
-                sequence = move._get_sequence()
-                if not sequence:
-                    raise UserError(_('Please define a sequence on your journal.'))
-                move.set_values_by_sequence(sequence)
-                """Fin Adición Inteligos al método genérico"""
+            """Adición Inteligos al método genérico, cambiar esta sección durante la migración entre
+                            versiones de Odoo"""
+            # Numeración por lotes según la secuencia del diario de cada documento
+            to_post._assign_values_by_sequence()
+            """Fin Adición Inteligos al método genérico"""
 
             customer_count, supplier_count = defaultdict(int), defaultdict(int)
             for invoice in to_post:
@@ -533,47 +891,66 @@ class AccountMoveInherited(models.Model):
                 lambda m: m.is_invoice(include_receipts=True) and m.currency_id.is_zero(m.amount_total)
             )._invoice_paid_hook()
 
+            self.env['gt.payment.forecast']._enqueue_moves(to_post)
             return to_post
         else:
             return super()._post(soft)
 
     @api.constrains('invoice_doc_serie', 'invoice_doc_number')
     def _check_duplicate_supplier_reference(self):
-        for invoice in self:
-            # refuse to validate a vendor bill/credit note if there already exists one with the same reference for
-            # the same partner, because it's probably a double encoding of the same bill/credit note only if the two
-            # invoices are validated.
-            # changegt
-            if invoice.country_code == 'GT':
-                self.ensure_one()
-                if invoice.move_type in (
-                        'in_invoice', 'in_refund') and invoice.invoice_doc_number and invoice.invoice_doc_serie:
-                    res = self.env['account.move'].search([
-                        ('move_type', '=', invoice.move_type),
-                        ('invoice_doc_serie', '=', invoice.invoice_doc_serie),
-                        ('invoice_doc_number', '=', invoice.invoice_doc_number),
-                        ('company_id', '=', invoice.company_id.id),
-                        ('partner_id', '=', invoice.partner_id.id),
-                        ('l10n_latam_document_type_id', '=', invoice.l10n_latam_document_type_id.id),
-                        ('id', '!=', invoice.id),
-                        ('state', 'in', ('draft', 'posted'))])
-                    if res:
-                        raise UserError(
-                            "Se ha detectado una referencia duplicada para la factura de proveedor. "
-                            "Es probable que tengas más de un documento con los mismos datos.")
+        # refuse to validate a vendor bill/credit note if there already exists one with the same reference for
+        # the same partner, because it's probably a double encoding of the same bill/credit note only if the two
+        # invoices are validated.
+        # changegt: una sola consulta para todo el lote, que incluye los duplicados dentro del mismo lote
+        invoices = self.filtered(lambda invoice: invoice.country_code == 'GT' and invoice.move_type in (
+            'in_invoice', 'in_refund') and invoice.invoice_doc_number and invoice.invoice_doc_serie
+            and invoice.partner_id)
+        if not invoices:
+            return
+        self.flush_model(['move_type', 'invoice_doc_serie', 'invoice_doc_number', 'company_id', 'partner_id',
+                          'l10n_latam_document_type_id', 'state'])
+        self.env.cr.execute("""
+            SELECT move.id
+              FROM account_move move
+              JOIN (SELECT id, move_type, invoice_doc_serie, invoice_doc_number, company_id, partner_id,
+                           l10n_latam_document_type_id
+                      FROM account_move
+                     WHERE %s) other
+                ON other.company_id = move.company_id
+               AND other.partner_id = move.partner_id
+               AND other.invoice_doc_serie = move.invoice_doc_serie
+               AND other.invoice_doc_number = move.invoice_doc_number
+               AND other.move_type = move.move_type
+               AND (other.l10n_latam_document_type_id = move.l10n_latam_document_type_id
+                    OR (other.l10n_latam_document_type_id IS NULL AND move.l10n_latam_document_type_id IS NULL))
+               AND other.id != move.id
+             WHERE move.id = ANY(%%s)
+             LIMIT 1
+        """ % SUPPLIER_REFERENCE_CONDITION, [invoices.ids])
+        if self.env.cr.fetchone():
+            raise UserError(
+                "Se ha detectado una referencia duplicada para la factura de proveedor. "
+                "Es probable que tengas más de un documento con los mismos datos.")
 
     def button_cancel(self):
         """Sobrescritura del método para agregar restricción según el campo ´date´, fecha contable.
             Si entre la fecha de hoy y la fecha contable no hay una diferencia mayor o igual a 2 meses,
             o bien, si el usuario pertenece al grupo administrativo de contabilidad se podrá anular los documentos.
         """
-        # changegt
-        if self.country_code == 'GT':
+        # changegt: basta con validar la fecha contable más antigua del lote
+        gt_moves = self.filtered(lambda move: move.country_code == 'GT')
+        if gt_moves and not self.env.user.has_group('account.group_account_manager'):
 
-            delta = relativedelta(fields.Date.context_today(self), self.date)
+            delta = relativedelta(fields.Date.context_today(self), min(gt_moves.mapped('date')))
             res_months = delta.months + (delta.years * 12)
 
-            if res_months >= 2 and not self.env.user.has_group('account.group_account_manager'):
+            if res_months >= 2:
                 raise UserError('No es posible anular un documento después de 2 meses de su publicación.')
 
         super(AccountMoveInherited, self).button_cancel()
+        self.env['gt.payment.forecast']._enqueue_moves(self)
+
+    def button_draft(self):
+        res = super().button_draft()
+        self.env['gt.payment.forecast']._enqueue_moves(self)
+        return res
@@ -1,13 +1,24 @@
 # -*- coding: utf-8 -*-
 
 from odoo import (fields, api, models)
+from odoo.tools.sql import column_exists, create_column
 
 
 class AccountInvoiceLine(models.Model):
     _inherit = "account.move.line"
 
     line_total = fields.Monetary(string='Importe', store=True, readonly=True, compute='_compute_price')
-    price_subtotal_signed_2 = fields.Monetary(string="Subtotal segun Tasa de Cambio", readonly=True)
+    price_subtotal_signed_2 = fields.Monetary(
+        string="Subtotal segun Tasa de Cambio", readonly=True, store=True,
+        compute='_compute_price_subtotal_signed_2', currency_field='company_currency_id'
+    )
+
+    def _auto_init(self):
+        """Creación de la columna price_subtotal_signed_2 para evitar su cálculo registro por registro al
+            instalar el módulo; las líneas existentes se llenan por account.move._cron_backfill_fx_amounts."""
+        if not column_exists(self.env.cr, self._table, 'price_subtotal_signed_2'):
+            create_column(self.env.cr, self._table, 'price_subtotal_signed_2', 'numeric')
+        return super()._auto_init()
 
     @api.depends('price_unit', 'discount', 'quantity', 'product_id', 'move_id.partner_id', 'move_id.currency_id',
                  'move_id.company_id', 'move_id.invoice_date', 'move_id.date')
@@ -15,3 +26,12 @@ class AccountInvoiceLine(models.Model):
         for rec in self:
             price = rec.price_unit * (1 - (rec.discount or 0.0) / 100.0)
             rec.line_total = price * rec.quantity
+
+    @api.depends('price_subtotal', 'move_id.move_type', 'move_id.currency_id', 'move_id.company_id',
+                 'move_id.invoice_date')
+    def _compute_price_subtotal_signed_2(self):
+        """Subtotal convertido con la tasa de la fecha de factura (account.move.inverse_rate_invoice),
+            negativo en documentos de salida (facturas de proveedor y notas de crédito de clientes)."""
+        for line in self:
+            sign = -1 if line.move_id.is_outbound() else 1
+            line.price_subtotal_signed_2 = sign * line.price_subtotal * line.move_id.inverse_rate_invoice
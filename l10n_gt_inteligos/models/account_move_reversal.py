@@ -16,8 +16,8 @@ class AccountMoveReversalInherited(models.TransientModel):
                 lambda x: not x.l10n_latam_document_type_id or
                           x.l10n_latam_document_type_id not in x.l10n_latam_available_document_type_ids):
             document_types = record.l10n_latam_available_document_type_ids._origin
-            sequence_document_type = record.journal_id.sequence_id.l10n_latam_document_type_id \
-                if record.journal_id.sequence_id else False
+            sequence_document_type = record.journal_id._origin._get_gt_default_document_type() \
+                if record.journal_id._origin else False
             if sequence_document_type and sequence_document_type in document_types:
                 record.l10n_latam_document_type_id = sequence_document_type
             else:
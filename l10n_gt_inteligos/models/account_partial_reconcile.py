@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models
+
+
+class AccountPartialReconcileInherited(models.Model):
+    """Encola la actualización de la proyección de pagos a proveedores (gt.payment.forecast) al conciliar o romper
+        la conciliación de facturas de proveedor, ya que cambia su saldo y estado de pago."""
+    _inherit = 'account.partial.reconcile'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        partials = super().create(vals_list)
+        self.env['gt.payment.forecast']._enqueue_moves(partials._get_reconciled_moves())
+        return partials
+
+    def unlink(self):
+        moves = self._get_reconciled_moves()
+        res = super().unlink()
+        self.env['gt.payment.forecast']._enqueue_moves(moves.exists())
+        return res
+
+    def _get_reconciled_moves(self):
+        return self.debit_move_id.move_id | self.credit_move_id.move_id
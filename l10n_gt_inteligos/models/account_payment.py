@@ -1,14 +1,22 @@
 # -*- coding: utf-8 -*-
 
-from num2words import num2words
+import logging
+
 from odoo.models import Model
 from odoo import (fields, api, models, _, Command)
 
+from odoo.tools.sql import column_exists, create_column
+
+from ..tools.amount_words import amount_to_words, amounts_to_words
+from ..tools.cron import CronBatchRunner
+
+_logger = logging.getLogger(__name__)
+
 
 class AccountPaymentInherited(Model):
     _inherit = "account.payment"
 
-    amount_in_words = fields.Char(compute='compute_amount_word', string='Monto en letras pagos')
+    amount_in_words = fields.Char(compute='compute_amount_word', store=True, string='Monto en letras pagos')
     print_to_report = fields.Boolean(string="Mostrar en reporte", default=True)
     method = fields.Selection(
         [
@@ -27,6 +35,43 @@ class AccountPaymentInherited(Model):
         string="Referencia de banco"
     )
 
+    def _auto_init(self):
+        """Creación de la columna amount_in_words para evitar su cálculo registro por registro al actualizar
+            el módulo; los pagos existentes se llenan en segundo plano por _cron_backfill_amount_words."""
+        if not column_exists(self.env.cr, self._table, 'amount_in_words'):
+            create_column(self.env.cr, self._table, 'amount_in_words', 'varchar')
+        return super()._auto_init()
+
+    @api.model
+    def _cron_backfill_amount_words(self, batch_size=1000, runner=None):
+        """
+        Calcula por lotes amount_in_words de los pagos existentes, confirmando cada lote. Se ejecuta desde la acción
+        planificada de account.move._cron_backfill_amount_words, con el mismo runner y por tanto el mismo plazo.
+        :param runner: CronBatchRunner de la acción planificada
+        :return: bool True si finalizó
+        """
+        count = 0
+
+        def step():
+            nonlocal count
+            self.env.cr.execute("""
+                SELECT id FROM account_payment WHERE amount_in_words IS NULL ORDER BY id DESC LIMIT %s
+            """, [batch_size])
+            payments = self.browse(row[0] for row in self.env.cr.fetchall())
+            if not payments:
+                return False
+            self.env.add_to_compute(self._fields['amount_in_words'], payments)
+            payments.flush_recordset(['amount_in_words'])
+            count += len(payments)
+            self.env.invalidate_all()
+            return True
+
+        runner = runner or CronBatchRunner(self.env, 'l10n_gt_inteligos.ir_cron_backfill_amount_words')
+        done = runner.run(step)
+        if count:
+            _logger.info("Amount in words backfilled for %s payments", count)
+        return done
+
     @api.model
     def convert_amount_in_words(self, amount, language, currency, lang):
         """
@@ -37,53 +82,22 @@ class AccountPaymentInherited(Model):
         :param lang: str value to localization
         :return: str amount in words
         """
-        list_lang = [['en', 'en_US'], ['en', 'en_AU'], ['en', 'en_GB'], ['en', 'en_IN'],
-                     ['fr', 'fr_BE'], ['fr', 'fr_CA'], ['fr', 'fr_CH'], ['fr', 'fr_FR'],
-                     ['es', 'es_ES'], ['es', 'es_AR'], ['es', 'es_BO'], ['es', 'es_CL'], ['es', 'es_CO'],
-                     ['es', 'es_CR'], ['es', 'es_DO'],
-                     ['es', 'es_EC'], ['es', 'es_GT'], ['es', 'es_MX'], ['es', 'es_PA'], ['es', 'es_PE'],
-                     ['es', 'es_PY'], ['es', 'es_UY'], ['es', 'es_VE'],
-                     ['lt', 'lt_LT'], ['lv', 'lv_LV'], ['no', 'nb_NO'], ['pl', 'pl_PL'], ['ru', 'ru_RU'],
-                     ['dk', 'da_DK'], ['pt_BR', 'pt_BR'], ['de', 'de_DE'], ['de', 'de_CH'],
-                     ['ar', 'ar_SY'], ['it', 'it_IT'], ['he', 'he_IL'], ['id', 'id_ID'], ['tr', 'tr_TR'],
-                     ['nl', 'nl_NL'], ['nl', 'nl_BE'], ['uk', 'uk_UA'], ['sl', 'sl_SI'], ['vi_VN', 'vi_VN']]
-
-        #     ['th','th_TH'],['cz','cs_CZ']
-        cnt = 0
-        for rec in list_lang[cnt:len(list_lang)]:
-            if rec[1] == lang:
-                language = rec[0]
-            cnt += 1
-
-        amount_str = str('{:2f}'.format(amount))
-        amount_str_splt = amount_str.split('.')
-        before_point_value = amount_str_splt[0]
-        after_point_value = amount_str_splt[1][:2]
-
-        before_amount_words = num2words(int(before_point_value), lang=language)
-        after_amount_words = num2words(int(after_point_value), lang=language)
-
-        amount = before_amount_words
-
-        if currency and currency.currency_unit_label:
-            amount += ' ' + currency.currency_unit_label
-
-        if currency and currency.amount_separator:
-            amount += ' ' + currency.amount_separator
-
-        if int(after_point_value) > 0:
-            amount += ' con ' + str(after_point_value) + '/100.'
-        else:
-            amount += ' exactos.'
-
-        return amount
-
-    @api.depends('amount')
+        return amount_to_words(
+            amount, language,
+            currency.currency_unit_label if currency else None,
+            currency.amount_separator if currency else None,
+            lang,
+        )
+
+    @api.depends('amount', 'currency_id.currency_unit_label', 'currency_id.amount_separator', 'partner_id.lang')
     def compute_amount_word(self):
-        """Método para manejar la conversión a letras de un monto de pago."""
-        for record in self:
-            amount = record.convert_amount_in_words(record.amount, 'es',
-                                                    record.currency_id, record.partner_id.lang)
+        """Método para manejar la conversión a letras de un monto, en una sola llamada para todos los registros."""
+        words = amounts_to_words([
+            (record.amount, record.currency_id.currency_unit_label, record.currency_id.amount_separator,
+             record.partner_id.lang)
+            for record in self
+        ])
+        for record, amount in zip(self, words):
             record.amount_in_words = amount.capitalize()
 
     _sql_constraints = [
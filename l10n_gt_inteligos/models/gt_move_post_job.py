@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import time
+
+import psycopg2
+
+from odoo import fields, api, models, _
+
+from ..tools.cron import CronBatchRunner
+
+_logger = logging.getLogger(__name__)
+
+
+class GTMovePostJob(models.Model):
+    """Publicación masiva de documentos en segundo plano. Los documentos se publican por bloques ordenados por
+        compañía, diario y fecha (y por tanto por secuencia), cada bloque en su propia transacción desde la
+        acción planificada. Un documento con error se registra como fallo sin revertir los bloques publicados.
+    """
+    _name = 'gt.move.post.job'
+    _description = 'Publicación masiva de documentos'
+    _order = 'id desc'
+
+    name = fields.Char(string="Descripción", required=True, readonly=True)
+    move_ids = fields.Many2many(
+        comodel_name='account.move',
+        relation='gt_move_post_job_move_rel',
+        string="Documentos",
+        readonly=True
+    )
+    chunk_size = fields.Integer(string="Documentos por bloque", default=200, readonly=True)
+    state = fields.Selection(
+        selection=[('pending', 'Pendiente'), ('running', 'En proceso'), ('done', 'Finalizado')],
+        default='pending', readonly=True, index=True, string="Estado"
+    )
+    total_count = fields.Integer(readonly=True, string="Documentos")
+    posted_count = fields.Integer(default=0, readonly=True, string="Publicados")
+    failed_count = fields.Integer(default=0, readonly=True, string="Con error")
+    progress = fields.Float(compute='_compute_progress', string="Progreso")
+    duration = fields.Float(default=0.0, readonly=True, string="Duración (s)",
+                            help='Tiempo de publicación acumulado de todos los bloques.')
+    throughput = fields.Float(compute='_compute_progress', string="Documentos por segundo")
+    date_start = fields.Datetime(readonly=True, string="Inicio")
+    date_done = fields.Datetime(readonly=True, string="Fecha de finalización")
+    failure_ids = fields.One2many(
+        comodel_name='gt.move.post.failure',
+        inverse_name='job_id',
+        string="Fallos",
+        readonly=True
+    )
+
+    @api.depends('total_count', 'posted_count', 'failed_count', 'duration', 'state')
+    def _compute_progress(self):
+        for job in self:
+            processed = job.posted_count + job.failed_count
+            job.progress = 100.0 if job.state == 'done' else 100.0 * processed / (job.total_count or 1)
+            job.throughput = job.posted_count / job.duration if job.duration else 0.0
+
+    @api.model
+    def _enqueue(self, moves, chunk_size=None):
+        """
+        Registra un trabajo de publicación para los documentos en borrador indicados y despierta la acción planificada.
+        :param moves: account.move a publicar
+        :param chunk_size: int documentos por bloque; por defecto el parámetro l10n_gt_inteligos.mass_post_chunk_size
+        :return: gt.move.post.job creado o un recordset vacío
+        """
+        moves = moves.filtered(lambda move: move.state == 'draft')
+        if not moves:
+            return self.browse()
+        chunk_size = chunk_size or int(self.env['ir.config_parameter'].sudo().get_param(
+            'l10n_gt_inteligos.mass_post_chunk_size', 200))
+        job = self.create({
+            'name': _("Publicación de %(count)s documentos", count=len(moves)),
+            'move_ids': [(6, 0, moves.ids)],
+            'chunk_size': chunk_size,
+            'total_count': len(moves),
+        })
+        self.env.ref('l10n_gt_inteligos.ir_cron_move_post_job')._trigger()
+        return job
+
+    def _get_next_chunk(self):
+        """Siguiente bloque de documentos en borrador, de una sola compañía, ordenado por diario y fecha."""
+        self.ensure_one()
+        moves = self.env['account.move'].search([
+            ('id', 'in', self.move_ids.ids),
+            ('id', 'not in', self.failure_ids.move_id.ids),
+            ('state', '=', 'draft'),
+        ], order='company_id, journal_id, date, id', limit=self.chunk_size)
+        return moves.filtered(lambda move: move.company_id == moves[:1].company_id)
+
+    def _post_chunk(self, moves):
+        """
+        Publica un bloque de documentos. Si el bloque falla, se publica documento por documento para aislar
+        los documentos con error.
+        :return: tuple (account.move publicados, list of tuple (account.move, mensaje de error))
+        """
+        try:
+            with self.env.cr.savepoint():
+                moves.action_post()
+            return moves, []
+        except psycopg2.OperationalError:
+            raise
+        except Exception:
+            _logger.info("Mass posting job %s: chunk failed, posting documents one by one", self.id)
+
+        posted = moves.browse()
+        failures = []
+        for move in moves:
+            try:
+                with self.env.cr.savepoint():
+                    move.action_post()
+                posted |= move
+            except psycopg2.OperationalError:
+                raise
+            except Exception as e:
+                failures.append((move, str(e)))
+        return posted, failures
+
+    def _process_chunk(self):
+        """
+        Procesa un bloque del trabajo con el usuario que lo creó.
+        :return: bool True si el trabajo finalizó
+        """
+        self.ensure_one()
+        job = self.with_user(self.create_uid)
+        moves = job._get_next_chunk()
+        if not moves:
+            self.write({'state': 'done', 'date_done': fields.Datetime.now()})
+            return True
+
+        job = job.with_context(allowed_company_ids=moves.company_id.ids)
+        moves = moves.with_env(job.env)
+        start = time.monotonic()
+        posted, failures = job._post_chunk(moves)
+        vals = {
+            'state': 'running',
+            'posted_count': self.posted_count + len(posted),
+            'failed_count': self.failed_count + len(failures),
+            'duration': self.duration + time.monotonic() - start,
+            'failure_ids': [(0, 0, {'move_id': move.id, 'message': message}) for move, message in failures],
+        }
+        if not self.date_start:
+            vals['date_start'] = fields.Datetime.now()
+        self.write(vals)
+        return False
+
+    @api.model
+    def _cron_process_jobs(self, time_limit=None):
+        """Acción planificada: procesa los trabajos pendientes por bloques, confirmando cada bloque."""
+        runner = CronBatchRunner(self.env, 'l10n_gt_inteligos.ir_cron_move_post_job', time_limit)
+        for job in self.search([('state', 'in', ('pending', 'running'))], order='id'):
+            if not runner.run(lambda: not job._process_chunk()):
+                return
+            _logger.info("Mass posting job %s done: %s posted, %s failed in %.1fs (%.1f documents/s)",
+                         job.id, job.posted_count, job.failed_count, job.duration, job.throughput)
+
+
+class GTMovePostFailure(models.Model):
+    """Documento que no pudo publicarse en un trabajo de publicación masiva."""
+    _name = 'gt.move.post.failure'
+    _description = 'Fallo de publicación masiva'
+    _order = 'id'
+
+    job_id = fields.Many2one('gt.move.post.job', string="Trabajo", required=True, ondelete='cascade', index=True)
+    move_id = fields.Many2one('account.move', string="Documento", required=True, ondelete='cascade')
+    message = fields.Text(string="Mensaje", readonly=True)
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+import threading
+from datetime import timedelta
+
+from psycopg2.extras import execute_values
+
+from odoo import fields, api, models
+
+from ..tools.nit import normalize_nit
+
+
+class GTNitCache(models.Model):
+    """Caché persistente de las consultas de NIT realizadas al servicio web de la SAT (FEL receptores).
+        Guarda la razón social obtenida, o el mensaje de error devuelto por la SAT, para evitar
+        consultas repetidas al servicio durante el ingreso de contactos.
+    """
+    _name = 'gt.nit.cache'
+    _description = 'Caché de consultas de NIT a la SAT'
+    _order = 'fetch_date desc'
+    _rec_name = 'nit'
+
+    nit = fields.Char(string="NIT", required=True, index=True, readonly=True)
+    legal_name = fields.Char(string="Razón Social", readonly=True)
+    error_message = fields.Char(
+        string="Mensaje SAT",
+        readonly=True,
+        help='Mensaje de error devuelto por la SAT. Si tiene valor, la consulta se guarda como resultado negativo.'
+    )
+    fetch_date = fields.Datetime(string="Fecha de consulta", readonly=True)
+    expiration_date = fields.Datetime(string="Fecha de vencimiento", index=True, readonly=True)
+
+    _sql_constraints = [
+        ('nit_unique', 'UNIQUE(nit)', 'Ya existe un registro en caché para el NIT ingresado.')
+    ]
+
+    @api.model
+    def _normalize_nit(self, nit):
+        """Normaliza el NIT para utilizarlo como llave de la caché."""
+        return normalize_nit(nit)
+
+    @api.model
+    def _get_param(self, key, default):
+        return int(self.env['ir.config_parameter'].sudo().get_param('l10n_gt_inteligos.%s' % key, default))
+
+    @api.model
+    def _get_cached_result(self, nit):
+        """
+        Obtiene el resultado vigente de la caché para el NIT ingresado.
+        :param nit: str NIT a consultar
+        :return: registro gt.nit.cache vigente o un recordset vacío si no existe o ya venció
+        """
+        return self._get_cached_results([nit]).get(self._normalize_nit(nit), self.browse())
+
+    @api.model
+    def _get_cached_results(self, nits):
+        """
+        Obtiene en una sola consulta los resultados vigentes de la caché para varios NITs.
+        :param nits: list of str NITs a consultar
+        :return: dict {NIT normalizado: registro gt.nit.cache vigente}
+        """
+        entries = self.sudo().search([
+            ('nit', 'in', list({self._normalize_nit(nit) for nit in nits})),
+            ('expiration_date', '>', fields.Datetime.now()),
+        ])
+        return {entry.nit: entry for entry in entries}
+
+    @api.model
+    def _store_result(self, nit, legal_name=False, error_message=False):
+        """
+        Guarda el resultado de una consulta a la SAT.
+        :param nit: str NIT consultado
+        :param legal_name: str razón social devuelta por la SAT
+        :param error_message: str mensaje de error devuelto por la SAT
+        :return: None
+        """
+        self._store_results([(nit, legal_name, error_message)])
+
+    @api.model
+    def _store_results(self, results):
+        """
+        Guarda en bloque los resultados de las consultas a la SAT, en la transacción actual.
+        :param results: list of tuple (nit, legal_name, error_message)
+        :return: None
+        """
+        if not results:
+            return
+        now = fields.Datetime.now()
+        positive_expiration = now + timedelta(days=self._get_param('nit_cache_ttl_days', 30))
+        negative_expiration = now + timedelta(hours=self._get_param('nit_cache_negative_ttl_hours', 12))
+        rows = {}
+        for nit, legal_name, error_message in results:
+            nit = self._normalize_nit(nit)
+            rows[nit] = (
+                nit, legal_name or None, error_message or None, now,
+                negative_expiration if error_message else positive_expiration,
+                self.env.uid, now, self.env.uid, now,
+            )
+        execute_values(self.env.cr._obj, """
+            INSERT INTO gt_nit_cache (nit, legal_name, error_message, fetch_date, expiration_date,
+                                      create_uid, create_date, write_uid, write_date)
+            VALUES %s
+            ON CONFLICT (nit) DO UPDATE
+               SET legal_name = EXCLUDED.legal_name,
+                   error_message = EXCLUDED.error_message,
+                   fetch_date = EXCLUDED.fetch_date,
+                   expiration_date = EXCLUDED.expiration_date,
+                   write_uid = EXCLUDED.write_uid,
+                   write_date = EXCLUDED.write_date
+        """, list(rows.values()))
+        self.invalidate_model()
+
+    @api.model
+    def _store_error_result(self, nit, error_message):
+        """
+        Guarda el mensaje de error de la SAT para un NIT cuando el llamador va a lanzar un ValidationError. Como el
+        error revierte la transacción actual, el resultado se guarda en un cursor independiente; durante las
+        pruebas se utiliza el cursor de la prueba para no dejar registros confirmados.
+        :param nit: str NIT consultado
+        :param error_message: str mensaje de error devuelto por la SAT
+        :return: None
+        """
+        if getattr(threading.current_thread(), 'testing', False):
+            self._store_result(nit, error_message=error_message)
+            return
+        with self.env.registry.cursor() as cr:
+            self.with_env(self.env(cr=cr))._store_result(nit, error_message=error_message)
+
+    @api.model
+    def _gc_nit_cache(self):
+        """Acción planificada: elimina los registros vencidos y, si la caché excede el tamaño máximo
+            configurado, los registros consultados hace más tiempo."""
+        self.env.cr.execute("DELETE FROM gt_nit_cache WHERE expiration_date < %s", [fields.Datetime.now()])
+        max_size = self._get_param('nit_cache_max_size', 200000)
+        self.env.cr.execute("""
+            DELETE FROM gt_nit_cache
+             WHERE id IN (SELECT id FROM gt_nit_cache ORDER BY fetch_date DESC, id DESC OFFSET %s)
+        """, [max_size])
+        self.invalidate_model()
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields, api, models
+from odoo.tools import create_index
+
+# Facturas de proveedor abiertas incluidas en la proyección
+# (sin alias de tabla, ya que también es la condición del índice parcial)
+OPEN_BILL_CONDITION = (
+    "move_type IN ('in_invoice', 'in_refund') AND state = 'posted' "
+    "AND payment_state IN ('not_paid', 'partial') AND payment_date IS NOT NULL"
+)
+
+
+class GTPaymentForecast(models.Model):
+    """Proyección de pagos a proveedores: saldo de las facturas de proveedor abiertas agrupado por compañía,
+        fecha de pago (siguiente día de pago de la compañía, account.move.payment_date), moneda y proveedor.
+        La tabla es materializada; al publicar, anular, pasar a borrador o conciliar facturas se encolan las llaves
+        afectadas (gt.payment.forecast.queue) y una acción planificada las recalcula fuera de la transacción del
+        documento. La proyección se reconstruye completa en una acción planificada nocturna.
+    """
+    _name = 'gt.payment.forecast'
+    _description = 'Proyección de pagos a proveedores'
+    _order = 'payment_date, company_id, partner_id'
+    _rec_name = 'partner_id'
+    _log_access = False
+    _check_company_auto = True
+
+    company_id = fields.Many2one('res.company', string="Compañía", readonly=True, index=True)
+    payment_date = fields.Date(string="Fecha de pago", readonly=True, index=True)
+    currency_id = fields.Many2one('res.currency', string="Moneda", readonly=True)
+    partner_id = fields.Many2one('res.partner', string="Proveedor", readonly=True, index=True, check_company=True)
+    company_currency_id = fields.Many2one(related='company_id.currency_id', string="Moneda de la compañía")
+    amount_residual = fields.Monetary(string="Saldo", readonly=True, currency_field='currency_id')
+    amount_residual_signed = fields.Monetary(
+        string="Saldo en moneda de la compañía", readonly=True, currency_field='company_currency_id'
+    )
+    bill_count = fields.Integer(string="Facturas", readonly=True)
+
+    _sql_constraints = [
+        ('forecast_key_unique', 'UNIQUE(company_id, payment_date, currency_id, partner_id)',
+         'Ya existe una línea de proyección para la compañía, fecha de pago, moneda y proveedor.')
+    ]
+
+    def init(self):
+        # Índice parcial: sólo las facturas de proveedor abiertas, con las columnas de agrupación
+        create_index(
+            self.env.cr,
+            'account_move_gt_open_bill_forecast_index',
+            'account_move',
+            ['company_id', 'payment_date', 'currency_id', 'commercial_partner_id'],
+            where=OPEN_BILL_CONDITION,
+        )
+
+    def _aggregate_query(self, key_join='', on_conflict=''):
+        # Saldos positivos para montos a pagar y negativos para notas de crédito de proveedor
+        return """
+            INSERT INTO gt_payment_forecast (company_id, payment_date, currency_id, partner_id,
+                                             amount_residual, amount_residual_signed, bill_count)
+                 SELECT company_id, payment_date, currency_id, commercial_partner_id,
+                        SUM(CASE WHEN move_type = 'in_refund' THEN -1 ELSE 1 END * amount_residual),
+                        -SUM(amount_residual_signed),
+                        COUNT(*)
+                   FROM account_move
+                   %s
+                  WHERE %s
+               GROUP BY company_id, payment_date, currency_id, commercial_partner_id
+                   %s
+        """ % (key_join, OPEN_BILL_CONDITION, on_conflict)
+
+    def _flush_bills(self):
+        self.env['account.move'].flush_model([
+            'move_type', 'state', 'payment_state', 'payment_date', 'company_id', 'currency_id',
+            'commercial_partner_id', 'amount_residual', 'amount_residual_signed',
+        ])
+
+    def _lock(self):
+        # Serializa las escrituras de la proyección entre la acción planificada por llaves y la reconstrucción completa
+        self.env.cr.execute("SELECT pg_advisory_xact_lock(hashtext('gt_payment_forecast'))")
+
+    @api.model
+    def _refresh_keys(self, keys):
+        """
+        Recalcula las líneas de la proyección para las llaves indicadas.
+        :param keys: iterable of tuple (company_id, payment_date, currency_id, partner_id)
+        """
+        keys = [key for key in set(keys) if all(key)]
+        if not keys:
+            return
+        self._flush_bills()
+        self._lock()
+        params = [[key[index] for key in keys] for index in range(4)]
+        self.env.cr.execute(self._aggregate_query("""
+                   JOIN unnest(%s::int[], %s::date[], %s::int[], %s::int[])
+                        AS key(key_company_id, key_payment_date, key_currency_id, key_partner_id)
+                     ON company_id = key_company_id
+                    AND payment_date = key_payment_date
+                    AND currency_id = key_currency_id
+                    AND commercial_partner_id = key_partner_id
+        """, """
+            ON CONFLICT (company_id, payment_date, currency_id, partner_id) DO UPDATE
+                    SET amount_residual = EXCLUDED.amount_residual,
+                        amount_residual_signed = EXCLUDED.amount_residual_signed,
+                        bill_count = EXCLUDED.bill_count
+        """), params)
+        # Llaves sin facturas abiertas
+        self.env.cr.execute("""
+            DELETE FROM gt_payment_forecast forecast
+             USING unnest(%%s::int[], %%s::date[], %%s::int[], %%s::int[])
+                   AS key(company_id, payment_date, currency_id, partner_id)
+             WHERE forecast.company_id = key.company_id
+               AND forecast.payment_date = key.payment_date
+               AND forecast.currency_id = key.currency_id
+               AND forecast.partner_id = key.partner_id
+               AND NOT EXISTS (SELECT 1
+                                 FROM account_move
+                                WHERE %s
+                                  AND company_id = key.company_id
+                                  AND payment_date = key.payment_date
+                                  AND currency_id = key.currency_id
+                                  AND commercial_partner_id = key.partner_id)
+        """ % OPEN_BILL_CONDITION, params)
+        self.invalidate_model()
+
+    @api.model
+    def _enqueue_moves(self, moves):
+        """
+        Encola las llaves de la proyección afectadas por los documentos indicados y despierta la acción planificada
+        que las recalcula. Sólo inserta en la cola, sin bloquear líneas de la proyección compartidas entre documentos.
+        """
+        bills = moves.filtered(lambda move: move.move_type in ('in_invoice', 'in_refund') and move.payment_date)
+        self.env['gt.payment.forecast.queue']._enqueue(
+            (bill.company_id.id, bill.payment_date, bill.currency_id.id, bill.commercial_partner_id.id)
+            for bill in bills
+        )
+
+    @api.model
+    def _cron_refresh_queue(self):
+        """Acción planificada: recalcula las llaves encoladas de la proyección de pagos."""
+        self._refresh_keys(self.env['gt.payment.forecast.queue']._pop_all())
+
+    @api.model
+    def _cron_refresh_forecast(self):
+        """Acción planificada: reconstrucción completa de la proyección de pagos."""
+        self._flush_bills()
+        self._lock()
+        self.env.cr.execute("DELETE FROM gt_payment_forecast")
+        self.env.cr.execute(self._aggregate_query())
+        self.invalidate_model()
+
+
+class GTPaymentForecastQueue(models.Model):
+    """Llaves de la proyección de pagos pendientes de recalcular. Sin restricción de unicidad, para que documentos
+        publicados en paralelo nunca compitan por la misma fila; los duplicados se descartan al procesar la cola.
+    """
+    _name = 'gt.payment.forecast.queue'
+    _description = 'Cola de recálculo de la proyección de pagos'
+    _log_access = False
+
+    company_id = fields.Many2one('res.company', string="Compañía", required=True, ondelete='cascade')
+    payment_date = fields.Date(string="Fecha de pago", required=True)
+    currency_id = fields.Many2one('res.currency', string="Moneda", required=True, ondelete='cascade')
+    partner_id = fields.Many2one('res.partner', string="Proveedor", required=True, ondelete='cascade')
+
+    @api.model
+    def _enqueue(self, keys):
+        """
+        :param keys: iterable of tuple (company_id, payment_date, currency_id, partner_id)
+        """
+        keys = [key for key in set(keys) if all(key)]
+        if not keys:
+            return
+        self.env.cr.execute("""
+            INSERT INTO gt_payment_forecast_queue (company_id, payment_date, currency_id, partner_id)
+                 SELECT * FROM unnest(%s::int[], %s::date[], %s::int[], %s::int[])
+        """, [[key[index] for key in keys] for index in range(4)])
+        self.env.ref('l10n_gt_inteligos.ir_cron_refresh_payment_forecast_queue')._trigger()
+
+    @api.model
+    def _pop_all(self):
+        """
+        Vacía la cola. Las llaves encoladas por transacciones aún abiertas quedan para la siguiente ejecución.
+        :return: set of tuple (company_id, payment_date, currency_id, partner_id)
+        """
+        self.env.cr.execute("""
+            DELETE FROM gt_payment_forecast_queue
+              RETURNING company_id, payment_date, currency_id, partner_id
+        """)
+        return set(self.env.cr.fetchall())
@@ -21,3 +21,10 @@ class GTRegion(Model):
         string="Sub-regiones"
     )
     description = Char(string="Descripción")
+
+    def unlink(self):
+        states = self.sub_region_ids.state_ids
+        res = super().unlink()
+        self.env['gt.region.recompute']._enqueue(states.exists())
+        self.env['gt.territorial.division']._clear_hierarchy_cache()
+        return res
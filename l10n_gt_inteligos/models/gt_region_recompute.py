@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+import logging
+
+from odoo import fields, api, models
+
+from ..tools.cron import CronBatchRunner
+
+_logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# gt_territorial_division
+# ----------------------------------------------------------
+# (modelo, tabla, columna del contacto o None si la tabla es res_partner, columna sub-región, columna región)
+REGION_RECOMPUTE_STAGES = [
+    ('res.partner', 'res_partner', None, 'sub_region_id', 'region_id'),
+    ('account.move', 'account_move', 'partner_id', 'sub_region_id', 'region_id'),
+    ('sale.order', 'sale_order', 'partner_invoice_id', 'sub_region_invoice_id', 'region_invoice_id'),
+    ('sale.order', 'sale_order', 'partner_shipping_id', 'sub_region_shipping_id', 'region_shipping_id'),
+]
+
+
+class GTRegionRecompute(models.Model):
+    """Trabajo en segundo plano para actualizar las regiones y sub-regiones almacenadas en contactos,
+        facturas y pedidos de venta cuando cambia la jerarquía territorial (sub-región de un departamento
+        o región de una sub-región). La actualización se realiza por SQL en bloques acotados,
+        confirmando la transacción después de cada bloque.
+    """
+    _name = 'gt.region.recompute'
+    _description = 'Recálculo de regiones geográficas'
+    _order = 'id'
+
+    state_ids = fields.Many2many(
+        comodel_name='res.country.state',
+        string="Departamentos",
+        readonly=True
+    )
+    stage = fields.Integer(default=0, readonly=True, string="Etapa")
+    last_id = fields.Integer(default=0, readonly=True, string="Último registro procesado")
+    processed_count = fields.Integer(default=0, readonly=True, string="Registros procesados")
+    updated_count = fields.Integer(default=0, readonly=True, string="Registros actualizados")
+    progress = fields.Float(compute='_compute_progress', string="Progreso")
+    state = fields.Selection(
+        selection=[('pending', 'Pendiente'), ('done', 'Finalizado')],
+        default='pending', readonly=True, index=True, string="Estado"
+    )
+    date_done = fields.Datetime(readonly=True, string="Fecha de finalización")
+
+    @api.depends('stage', 'state')
+    def _compute_progress(self):
+        for job in self:
+            job.progress = 100.0 if job.state == 'done' else 100.0 * job.stage / len(REGION_RECOMPUTE_STAGES)
+
+    @api.model
+    def _enqueue(self, states):
+        """
+        Registra un trabajo de recálculo para los departamentos indicados y despierta la acción planificada.
+        :param states: res.country.state cuyos registros dependientes deben actualizarse
+        :return: gt.region.recompute creado o un recordset vacío
+        """
+        if not states:
+            return self.browse()
+        job = self.sudo().create({'state_ids': [(6, 0, states.ids)]})
+        self.env.ref('l10n_gt_inteligos.ir_cron_region_recompute')._trigger()
+        return job
+
+    def _process_chunk(self, chunk_size):
+        """
+        Procesa un bloque de la etapa actual del trabajo.
+        :return: bool True si el trabajo finalizó
+        """
+        self.ensure_one()
+        model_name, table, partner_column, sub_region_column, region_column = REGION_RECOMPUTE_STAGES[self.stage]
+        self.env.cr.execute("""
+            SELECT record.id
+              FROM %(table)s record
+              JOIN res_partner partner ON partner.id = record.%(partner_column)s
+             WHERE partner.state_id = ANY(%%(state_ids)s)
+               AND record.id > %%(last_id)s
+          ORDER BY record.id
+             LIMIT %%(limit)s
+        """ % {'table': table, 'partner_column': partner_column or 'id'},
+            {'state_ids': self.state_ids.ids, 'last_id': self.last_id, 'limit': chunk_size})
+        ids = [row[0] for row in self.env.cr.fetchall()]
+
+        updated = 0
+        if ids:
+            self.env.cr.execute("""
+                UPDATE %(table)s record
+                   SET %(sub_region_column)s = state.sub_region_id,
+                       %(region_column)s = sub_region.region_id
+                  FROM res_partner partner
+                  JOIN res_country_state state ON state.id = partner.state_id
+             LEFT JOIN gt_sub_region sub_region ON sub_region.id = state.sub_region_id
+                 WHERE partner.id = record.%(partner_column)s
+                   AND record.id = ANY(%%(ids)s)
+                   AND (record.%(sub_region_column)s IS DISTINCT FROM state.sub_region_id
+                        OR record.%(region_column)s IS DISTINCT FROM sub_region.region_id)
+            """ % {
+                'table': table,
+                'partner_column': partner_column or 'id',
+                'sub_region_column': sub_region_column,
+                'region_column': region_column,
+            }, {'ids': ids})
+            updated = self.env.cr.rowcount
+            self.env[model_name].invalidate_model([sub_region_column, region_column])
+
+        vals = {
+            'processed_count': self.processed_count + len(ids),
+            'updated_count': self.updated_count + updated,
+        }
+        if len(ids) == chunk_size:
+            vals['last_id'] = ids[-1]
+        elif self.stage + 1 < len(REGION_RECOMPUTE_STAGES):
+            vals.update({'stage': self.stage + 1, 'last_id': 0})
+        else:
+            vals.update({'stage': len(REGION_RECOMPUTE_STAGES), 'state': 'done', 'date_done': fields.Datetime.now()})
+        self.write(vals)
+        return self.state == 'done'
+
+    @api.model
+    def _cron_process_jobs(self, chunk_size=5000, time_limit=None):
+        """Acción planificada: procesa los trabajos pendientes por bloques, confirmando cada bloque."""
+        runner = CronBatchRunner(self.env, 'l10n_gt_inteligos.ir_cron_region_recompute', time_limit)
+        for job in self.search([('state', '=', 'pending')]):
+            if not runner.run(lambda: not job._process_chunk(chunk_size)):
+                return
+            _logger.info("Region recompute job %s done: %s records processed, %s updated",
+                         job.id, job.processed_count, job.updated_count)
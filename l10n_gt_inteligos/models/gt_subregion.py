@@ -2,6 +2,7 @@
 
 from odoo.models import Model
 from odoo.fields import (Char, Many2one, One2many)
+from odoo.api import model_create_multi
 
 
 class GTSubRegion(Model):
@@ -21,3 +22,23 @@ class GTSubRegion(Model):
         string="Departamentos"
     )
     description = Char(string="Descripción")
+
+    @model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['gt.territorial.division']._clear_hierarchy_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'region_id'}.intersection(vals):
+            self.env['gt.territorial.division']._clear_hierarchy_cache()
+            self.env['gt.region.recompute']._enqueue(self.state_ids)
+        return res
+
+    def unlink(self):
+        states = self.state_ids
+        res = super().unlink()
+        self.env['gt.region.recompute']._enqueue(states.exists())
+        self.env['gt.territorial.division']._clear_hierarchy_cache()
+        return res
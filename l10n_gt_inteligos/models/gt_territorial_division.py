@@ -0,0 +1,382 @@
+# -*- coding: utf-8 -*-
+
+import csv
+import hashlib
+import heapq
+import io
+import logging
+import re
+import unicodedata
+from collections import defaultdict, namedtuple
+
+from psycopg2.extras import execute_values
+
+from odoo import api, models
+from odoo.osv.expression import AND
+from odoo.tools import file_open, ormcache
+
+_logger = logging.getLogger(__name__)
+
+# ----------------------------------------------------------
+# gt_territorial_division
+# ----------------------------------------------------------
+TerritorialHierarchy = namedtuple('TerritorialHierarchy', [
+    'counties',             # {county_id: (name, state_id)}
+    'zones',                # {zone_id: (name, county_id)}
+    'states',               # {state_id: (name, country_id, sub_region_id)}
+    'sub_regions',          # {sub_region_id: region_id}
+    'state_county_ids',     # {state_id: (county_id, ...)}
+    'county_zone_ids',      # {county_id: (zone_id, ...)}
+    'sub_region_state_ids',  # {sub_region_id: (state_id, ...)}
+    'region_sub_region_ids',  # {region_id: (sub_region_id, ...)}
+])
+
+AddressSearchIndex = namedtuple('AddressSearchIndex', [
+    'labels',       # {id: 'Zona N, Municipio, Departamento'}
+    'names',        # {id: nombre normalizado}
+    'positions',    # {id: posición en el orden por defecto (etiquetas más cortas primero)}
+    'prefixes',     # {prefijo de palabra normalizado: frozenset(ids)}
+    'trigrams',     # {trigrama normalizado: frozenset(ids)}
+])
+
+_WORD_RE = re.compile(r'\w+')
+
+# Datos maestros cargados en bloque por _load_territorial_data, en orden de dependencia:
+# (modelo, tabla, ruta, {columna CSV: columna de texto}, {columna CSV con xmlid: columna many2one})
+TERRITORIAL_DATA_FILES = [
+    ('gt.county', 'gt_county', 'l10n_gt_inteligos/data/gt.county.csv',
+     {'name': 'name', 'gt_code': 'gt_code'}, {'state_id:id': 'state_id'}),
+    ('gt.zone', 'gt_zone', 'l10n_gt_inteligos/data/gt.zone.csv',
+     {'name': 'name'}, {'county_id:id': 'county_id'}),
+]
+TERRITORIAL_DATA_HASH_PARAM = 'l10n_gt_inteligos.territorial_data_hash'
+
+
+def normalize_search_text(value):
+    """Texto en minúsculas y sin tildes ni diéresis, ej. 'Cobán' -> 'coban'."""
+    value = unicodedata.normalize('NFKD', value or '')
+    return ''.join(char for char in value if not unicodedata.combining(char)).lower()
+
+
+def _trigrams(text):
+    padded = '  %s ' % text
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class GTTerritorialDivision(models.AbstractModel):
+    """Caché a nivel de proceso de la división territorial de Guatemala
+        (región, sub-región, departamento, municipio y zona).
+        Los datos son estáticos, por lo que se cargan una sola vez por registro y se invalidan
+        al crear, modificar o eliminar cualquiera de los registros de la jerarquía.
+    """
+    _name = 'gt.territorial.division'
+    _description = 'División territorial de Guatemala'
+
+    @api.model
+    @ormcache()
+    def _get_hierarchy(self):
+        """
+        Carga completa de la jerarquía territorial con búsquedas O(1) de padres e hijos.
+        Las estructuras devueltas son compartidas entre transacciones y no deben modificarse.
+        :return: TerritorialHierarchy
+        """
+        self.env['gt.county'].flush_model(['name', 'state_id'])
+        self.env['gt.zone'].flush_model(['name', 'county_id'])
+        self.env['res.country.state'].flush_model(['name', 'country_id', 'sub_region_id'])
+        self.env['gt.sub_region'].flush_model(['region_id'])
+        cr = self.env.cr
+
+        cr.execute("SELECT id, name, state_id FROM gt_county")
+        counties = {county_id: (name, state_id) for county_id, name, state_id in cr.fetchall()}
+        cr.execute("SELECT id, name, county_id FROM gt_zone")
+        zones = {zone_id: (name, county_id) for zone_id, name, county_id in cr.fetchall()}
+        cr.execute("""
+            SELECT id, name, country_id, sub_region_id
+              FROM res_country_state
+             WHERE sub_region_id IS NOT NULL
+                OR id IN (SELECT state_id FROM gt_county)
+        """)
+        states = {row[0]: row[1:] for row in cr.fetchall()}
+        cr.execute("SELECT id, region_id FROM gt_sub_region")
+        sub_regions = dict(cr.fetchall())
+
+        state_county_ids = defaultdict(list)
+        for county_id, (_name, state_id) in counties.items():
+            state_county_ids[state_id].append(county_id)
+        county_zone_ids = defaultdict(list)
+        for zone_id, (_name, county_id) in zones.items():
+            county_zone_ids[county_id].append(zone_id)
+        sub_region_state_ids = defaultdict(list)
+        for state_id, (_name, _country_id, sub_region_id) in states.items():
+            if sub_region_id:
+                sub_region_state_ids[sub_region_id].append(state_id)
+        region_sub_region_ids = defaultdict(list)
+        for sub_region_id, region_id in sub_regions.items():
+            if region_id:
+                region_sub_region_ids[region_id].append(sub_region_id)
+
+        return TerritorialHierarchy(
+            counties=counties,
+            zones=zones,
+            states=states,
+            sub_regions=sub_regions,
+            state_county_ids={key: tuple(ids) for key, ids in state_county_ids.items()},
+            county_zone_ids={key: tuple(ids) for key, ids in county_zone_ids.items()},
+            sub_region_state_ids={key: tuple(ids) for key, ids in sub_region_state_ids.items()},
+            region_sub_region_ids={key: tuple(ids) for key, ids in region_sub_region_ids.items()},
+        )
+
+    @api.model
+    def _get_state_regions(self, state_id):
+        """
+        Sub-región y región de un departamento.
+        :param state_id: int id de res.country.state
+        :return: tuple (sub_region_id, region_id), con False si no están definidos
+        """
+        hierarchy = self._get_hierarchy()
+        sub_region_id = hierarchy.states.get(state_id, (False, False, False))[2] or False
+        return sub_region_id, hierarchy.sub_regions.get(sub_region_id) or False
+
+    @api.model
+    def _get_county_location(self, county_id):
+        """
+        Departamento y país de un municipio.
+        :param county_id: int id de gt.county
+        :return: tuple (state_id, country_id), con False si no están definidos
+        """
+        hierarchy = self._get_hierarchy()
+        state_id = hierarchy.counties.get(county_id, (False, False))[1] or False
+        return state_id, hierarchy.states.get(state_id, (False, False, False))[1] or False
+
+    @api.model
+    def _get_county_name(self, county_id):
+        return self._get_hierarchy().counties.get(county_id, (False, False))[0] or False
+
+    @api.model
+    @ormcache('model_name')
+    def _get_address_search_index(self, model_name):
+        """
+        Índice en memoria para el autocompletado de municipios ('gt.county') o zonas ('gt.zone'),
+        insensible a tildes y mayúsculas, construido a partir de la jerarquía territorial.
+        :return: AddressSearchIndex
+        """
+        hierarchy = self._get_hierarchy()
+        labels = {}
+        if model_name == 'gt.county':
+            for county_id, (name, state_id) in hierarchy.counties.items():
+                state_name = hierarchy.states.get(state_id, (False,))[0]
+                labels[county_id] = ', '.join(filter(None, [name, state_name]))
+            names = {county_id: normalize_search_text(name) for county_id, (name, _state_id) in hierarchy.counties.items()}
+        else:
+            for zone_id, (name, county_id) in hierarchy.zones.items():
+                county_name, state_id = hierarchy.counties.get(county_id, (False, False))
+                state_name = hierarchy.states.get(state_id, (False,))[0]
+                labels[zone_id] = ', '.join(filter(None, [name, county_name, state_name]))
+            names = {zone_id: normalize_search_text(name) for zone_id, (name, _county_id) in hierarchy.zones.items()}
+
+        prefixes = defaultdict(set)
+        trigrams = defaultdict(set)
+        for record_id, label in labels.items():
+            text = normalize_search_text(label)
+            for word in _WORD_RE.findall(text):
+                for size in range(1, len(word) + 1):
+                    prefixes[word[:size]].add(record_id)
+            for trigram in _trigrams(text):
+                trigrams[trigram].add(record_id)
+
+        ordered_ids = sorted(labels, key=lambda record_id: (len(labels[record_id]), labels[record_id]))
+        return AddressSearchIndex(
+            labels=labels,
+            names=names,
+            positions={record_id: position for position, record_id in enumerate(ordered_ids)},
+            prefixes={key: frozenset(ids) for key, ids in prefixes.items()},
+            trigrams={key: frozenset(ids) for key, ids in trigrams.items()},
+        )
+
+    @api.model
+    def _search_address(self, model_name, name, limit=None):
+        """
+        Autocompletado de municipios o zonas. Cada palabra buscada debe ser prefijo de alguna palabra de la
+        etiqueta ('zon 1 cob' encuentra 'Zona 1, Cobán, Alta Verapaz'); si ninguna etiqueta coincide,
+        se ordena por similitud de trigramas para tolerar errores de escritura.
+        :param model_name: str 'gt.county' o 'gt.zone'
+        :param name: str texto buscado
+        :param limit: int cantidad máxima de resultados
+        :return: list of tuple (id, etiqueta) ordenada por relevancia
+        """
+        index = self._get_address_search_index(model_name)
+        text = normalize_search_text(name).strip()
+        words = _WORD_RE.findall(text)
+        if not words:
+            return []
+
+        candidates = None
+        for word in sorted(words, key=len, reverse=True):
+            ids = index.prefixes.get(word, frozenset())
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                break
+
+        if candidates:
+            def rank(record_id):
+                record_name = index.names[record_id]
+                return (record_name != text, not record_name.startswith(text), index.positions[record_id])
+            ranked = heapq.nsmallest(limit, candidates, key=rank) if limit else sorted(candidates, key=rank)
+        else:
+            searched = _trigrams(text)
+            scores = defaultdict(int)
+            for trigram in searched:
+                for record_id in index.trigrams.get(trigram, ()):
+                    scores[record_id] += 1
+            # Similitud mínima para no devolver resultados sin relación con el texto buscado
+            threshold = max(1, len(searched) * 0.3)
+            ranked = sorted(
+                (record_id for record_id, score in scores.items() if score >= threshold),
+                key=lambda record_id: (-scores[record_id], index.positions[record_id]),
+            )[:limit]
+        return [(record_id, index.labels[record_id]) for record_id in ranked]
+
+    @api.model
+    def _name_search_address(self, model_name, name, domain=None, limit=100):
+        """
+        Resultado de name_search para municipios y zonas a partir del índice en memoria.
+        Los resultados se filtran con el dominio recibido (y las reglas de acceso) en una sola consulta,
+        conservando el orden de relevancia.
+        :return: list of tuple (id, etiqueta)
+        """
+        # Sin dominio no es necesario ordenar todas las coincidencias
+        ranked = self._search_address(model_name, name, limit=None if domain else limit)
+        if not ranked:
+            return []
+        ranked_ids = [record_id for record_id, _label in ranked]
+        allowed = set(self.env[model_name]._search(AND([domain or [], [('id', 'in', ranked_ids)]])))
+        result = [(record_id, label) for record_id, label in ranked if record_id in allowed]
+        return result[:limit] if limit else result
+
+    @api.model
+    def _load_territorial_data(self):
+        """
+        Carga en bloque de municipios y zonas desde los archivos CSV del módulo, en lugar de la importación
+        registro por registro del ORM. Se compara contra los xmlid existentes, se insertan o actualizan los
+        registros con execute_values y la carga se omite si el contenido de los archivos no cambió.
+        Se ejecuta desde data/gt_territorial_data.xml en la instalación y en cada actualización del módulo.
+        """
+        module = 'l10n_gt_inteligos'
+        digest = hashlib.sha256()
+        datasets = []
+        for model_name, table, path, columns, references in TERRITORIAL_DATA_FILES:
+            with file_open(path, 'rb') as f:
+                content = f.read()
+            digest.update(content)
+            rows = list(csv.DictReader(io.StringIO(content.decode('utf-8'))))
+            datasets.append((model_name, table, columns, references, rows))
+
+        # Los xmlid siempre se registran como cargados, de lo contrario la limpieza al final de la
+        # actualización del módulo eliminaría los registros que no pasaron por el ORM
+        expected = 0
+        for _model_name, _table, _columns, _references, rows in datasets:
+            self.pool.loaded_xmlids.update('%s.%s' % (module, row['id']) for row in rows)
+            expected += len(rows)
+
+        cr = self.env.cr
+        params = self.env['ir.config_parameter'].sudo()
+        cr.execute("SELECT COUNT(*) FROM ir_model_data WHERE module = %s AND model = ANY(%s)",
+                   [module, [dataset[0] for dataset in datasets]])
+        if params.get_param(TERRITORIAL_DATA_HASH_PARAM) == digest.hexdigest() and cr.fetchone()[0] >= expected:
+            _logger.info("Territorial master data unchanged, skipping load")
+            return
+
+        self.env.flush_all()
+        for model_name, table, columns, references, rows in datasets:
+            self._load_territorial_rows(module, model_name, table, columns, references, rows)
+            self.env[model_name].invalidate_model()
+        # Campo relacionado almacenado: país del departamento de cada municipio
+        cr.execute("""
+            UPDATE gt_county county
+               SET country_id = state.country_id
+              FROM res_country_state state
+             WHERE state.id = county.state_id
+               AND county.country_id IS DISTINCT FROM state.country_id
+        """)
+        self.env['gt.county'].invalidate_model(['country_id'])
+        params.set_param(TERRITORIAL_DATA_HASH_PARAM, digest.hexdigest())
+        self._clear_hierarchy_cache()
+
+    @api.model
+    def _load_territorial_rows(self, module, model_name, table, columns, references, rows):
+        """
+        Inserta o actualiza los registros de un archivo de datos maestros.
+        Los registros marcados como noupdate en ir.model.data no se modifican.
+        """
+        cr = self.env.cr
+        cr.execute("SELECT name, res_id, noupdate FROM ir_model_data WHERE module = %s AND model = %s",
+                   [module, model_name])
+        existing = {name: (res_id, noupdate) for name, res_id, noupdate in cr.fetchall()}
+
+        # Resolución en una sola consulta de las referencias, ej. base.state_gt_ave
+        def full_xmlid(xmlid):
+            return xmlid if '.' in xmlid else '%s.%s' % (module, xmlid)
+
+        # Por módulo y nombre, para utilizar el índice único (module, name) de ir_model_data
+        xmlids = [xmlid.split('.', 1) for xmlid in {
+            full_xmlid(row[column]) for row in rows for column in references if row[column]}]
+        cr.execute("""
+            SELECT data.module || '.' || data.name, data.res_id
+              FROM ir_model_data data
+              JOIN unnest(%s::varchar[], %s::varchar[]) AS ref(module, name)
+                ON data.module = ref.module AND data.name = ref.name
+        """, [[module_name for module_name, _name in xmlids], [name for _module, name in xmlids]])
+        ref_ids = dict(cr.fetchall())
+
+        to_insert, to_update = [], []
+        for row in rows:
+            values = [row[column] or None for column in columns]
+            values += [ref_ids.get(full_xmlid(row[column])) if row[column] else None for column in references]
+            res_id, noupdate = existing.get(row['id'], (None, False))
+            if res_id is None:
+                to_insert.append((row['id'], values))
+            elif not noupdate:
+                to_update.append(values + [res_id])
+
+        field_columns = list(columns.values()) + list(references.values())
+        casts = ['%s::varchar'] * len(columns) + ['%s::int'] * len(references)
+        uid, now = self.env.uid, cr.now()
+        if to_update:
+            execute_values(cr._obj, """
+                UPDATE %(table)s record
+                   SET %(assignments)s, write_uid = data.write_uid, write_date = data.write_date
+                  FROM (VALUES %%s) AS data(%(columns)s, id, write_uid, write_date)
+                 WHERE record.id = data.id
+                   AND (%(changes)s)
+            """ % {
+                'table': table,
+                'assignments': ', '.join('%s = data.%s' % (column, column) for column in field_columns),
+                'columns': ', '.join(field_columns),
+                'changes': ' OR '.join('record.%s IS DISTINCT FROM data.%s' % (column, column)
+                                       for column in field_columns),
+            }, [values + [uid, now] for values in to_update],
+                template='(%s, %%s::int, %%s::int, %%s::timestamp)' % ', '.join(casts), page_size=1000)
+
+        if to_insert:
+            new_ids = execute_values(cr._obj, """
+                INSERT INTO %s (%s, create_uid, create_date, write_uid, write_date)
+                VALUES %%s
+                RETURNING id
+            """ % (table, ', '.join(field_columns)), [
+                values + [uid, now, uid, now] for _name, values in to_insert
+            ], template='(%s, %%s, %%s, %%s, %%s)' % ', '.join(casts), page_size=len(to_insert), fetch=True)
+            execute_values(cr._obj, """
+                INSERT INTO ir_model_data (module, name, model, res_id, noupdate,
+                                           create_uid, create_date, write_uid, write_date)
+                VALUES %s
+            """, [
+                (module, name, model_name, new_id, False, uid, now, uid, now)
+                for (name, _values), (new_id,) in zip(to_insert, new_ids)
+            ], page_size=1000)
+
+        _logger.info("Territorial master data %s: %s inserted, %s checked for update",
+                     model_name, len(to_insert), len(to_update))
+
+    @api.model
+    def _clear_hierarchy_cache(self):
+        self.env.registry.clear_cache()
@@ -2,6 +2,7 @@
 
 from odoo.models import Model
 from odoo.fields import (Char, Many2one)
+from odoo.api import model, model_create_multi
 
 
 class GTZone(Model):
@@ -42,3 +43,29 @@ class GTZone(Model):
     gt_code = Char(
         string="Codigo"
     )
+
+    @model
+    def name_search(self, name='', domain=None, operator='ilike', limit=100):
+        # Autocompletado insensible a tildes sobre el índice en memoria de la división territorial
+        if name and operator == 'ilike':
+            result = self.env['gt.territorial.division']._name_search_address(self._name, name, domain, limit)
+            if result:
+                return result
+        return super().name_search(name, domain, operator, limit)
+
+    @model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['gt.territorial.division']._clear_hierarchy_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'name', 'county_id'}.intersection(vals):
+            self.env['gt.territorial.division']._clear_hierarchy_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env['gt.territorial.division']._clear_hierarchy_cache()
+        return res
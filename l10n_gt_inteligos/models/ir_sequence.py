@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from string import ascii_uppercase
+
 from odoo import models, fields
 
 
@@ -11,6 +13,101 @@ class IrSequenceInherited(models.Model):
 
     country_code = fields.Char(string="Country code", compute="_compute_current_company_country_code")
 
+    # changegt: numeración por subrangos, cada subrango es una serie propia y sin saltos
+    gt_parent_sequence_id = fields.Many2one(
+        comodel_name='ir.sequence', string='Secuencia principal', index='btree_not_null', ondelete='restrict',
+        help='Secuencia del diario de la que esta secuencia es un subrango (numeración por subrangos).'
+    )
+    gt_shard_ids = fields.One2many(
+        comodel_name='ir.sequence', inverse_name='gt_parent_sequence_id', string='Subrangos',
+        context={'active_test': False}
+    )
+
     def _compute_current_company_country_code(self):
         for record in self:
             record.country_code = self.env.company.account_fiscal_country_id.code
+
+    def _reserve_numbers(self, count, sequence_date=None):
+        """
+        Reserva un bloque de ``count`` números consecutivos de la secuencia (o de su rango de fechas) en una sola
+        sentencia. En secuencias 'no_gap' la fila queda bloqueada hasta el fin de la transacción, igual que con
+        next_by_id, por lo que se mantiene la numeración sin saltos.
+        :param count: int cantidad de números a reservar
+        :param sequence_date: date fecha para seleccionar el rango de fechas de la secuencia
+        :return: list of int números reservados, en orden
+        """
+        self.ensure_one()
+        if count <= 0:
+            return []
+        current = self._get_current_sequence(sequence_date=sequence_date)
+        increment = self.number_increment
+        if self.implementation == 'standard':
+            pg_sequence = 'ir_sequence_%03d_%03d' % (self.id, current.id) if self.use_date_range \
+                else 'ir_sequence_%03d' % self.id
+            self.env.cr.execute("SELECT nextval(%s) FROM generate_series(1, %s)", [pg_sequence, count])
+            return sorted(row[0] for row in self.env.cr.fetchall())
+
+        current.flush_recordset(['number_next'])
+        self.env.cr.execute(
+            "UPDATE %s SET number_next = number_next + %%s WHERE id = %%s RETURNING number_next" % current._table,
+            [increment * count, current.id]
+        )
+        number_end = self.env.cr.fetchone()[0]
+        current.invalidate_recordset(['number_next'])
+        return list(range(number_end - increment * count, number_end, increment))
+
+    def _next_block_by_id(self, count, sequence_date=None):
+        """
+        Forma por lotes de next_by_id.
+        :return: list of tuple (número, nombre con prefijo y sufijo) en orden
+        """
+        self.ensure_one()
+        numbers = self._reserve_numbers(count, sequence_date=sequence_date)
+        sequence = self
+        if self.use_date_range:
+            date_range = self._get_current_sequence(sequence_date=sequence_date)
+            sequence = self.with_context(ir_sequence_date_range=date_range.date_from)
+        prefix, suffix = sequence._get_prefix_suffix()
+        number_format = '%%0%sd' % self.padding
+        return [(number, prefix + number_format % number + suffix) for number in numbers]
+
+    def _gt_sync_shards(self, count):
+        """
+        Crea los subrangos faltantes de la secuencia hasta ``count`` y archiva los sobrantes. Cada subrango copia la
+        configuración de la secuencia y agrega una letra al prefijo, por lo que cada uno es una serie distinta. Los
+        rangos de fechas no se copian: cada subrango crea los suyos desde 1 al numerar. Los subrangos nunca se
+        eliminan, ya que pueden tener documentos numerados.
+        :param count: int cantidad de subrangos activos, máximo 26
+        """
+        for sequence in self:
+            shards = sequence.with_context(active_test=False).gt_shard_ids.sorted('id')
+            for index in range(len(shards), count):
+                shards |= sequence.copy({
+                    'name': '%s %s' % (sequence.name, ascii_uppercase[index]),
+                    'prefix': (sequence.prefix or '') + ascii_uppercase[index],
+                    'number_next': 1,
+                    'date_range_ids': [],
+                    'gt_parent_sequence_id': sequence.id,
+                })
+            shards[:count].filtered(lambda shard: not shard.active).active = True
+            shards[count:].filtered('active').active = False
+
+    def _gt_pick_shard(self):
+        """
+        Selecciona un subrango activo que no esté bloqueado por otra transacción (FOR UPDATE SKIP LOCKED) y lo deja
+        bloqueado hasta el fin de la transacción. Las transacciones concurrentes numeran así en series distintas sin
+        esperar entre sí; sólo si todos los subrangos están ocupados se espera por el primero.
+        :return: ir.sequence subrango, o la misma secuencia si no tiene subrangos
+        """
+        self.ensure_one()
+        query = """
+            SELECT id FROM ir_sequence
+             WHERE gt_parent_sequence_id = %s AND active
+          ORDER BY id LIMIT 1 FOR UPDATE{}
+        """
+        self.env.cr.execute(query.format(' SKIP LOCKED'), [self.id])
+        row = self.env.cr.fetchone()
+        if not row:
+            self.env.cr.execute(query.format(''), [self.id])
+            row = self.env.cr.fetchone()
+        return self.browse(row[0]) if row else self
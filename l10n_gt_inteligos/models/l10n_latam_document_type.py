@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+
+from odoo import api, models
+
+
+class L10nLatamDocumentTypeInherited(models.Model):
+    _inherit = 'l10n_latam.document.type'
+
+    @api.model
+    def _get_gt_document_type(self, name):
+        """
+        Tipo de documento de Guatemala por su identificador externo, ej. 'dc_fesp'. A diferencia de env.ref no se
+        verifica la existencia del registro con una consulta: se utiliza la caché de identificadores externos del
+        registro (ir.model.data._xmlid_lookup), que se invalida al modificar o eliminar los identificadores.
+        :param name: str identificador externo sin el nombre del módulo
+        :return: l10n_latam.document.type o un recordset vacío
+        """
+        return self.browse(
+            self.env['ir.model.data']._xmlid_to_res_id('l10n_gt_inteligos.%s' % name, raise_if_not_found=False))
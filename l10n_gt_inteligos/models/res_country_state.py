@@ -2,6 +2,7 @@
 
 from odoo.models import Model
 from odoo.fields import Many2one, Char
+from odoo.api import model_create_multi
 
 
 class InheritResCountryState(Model):
@@ -12,3 +13,22 @@ class InheritResCountryState(Model):
 
     sub_region_id = Many2one(comodel_name="gt.sub_region", string="Sub-región")
     gt_code = Char('Code')
+
+    @model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        self.env['gt.territorial.division']._clear_hierarchy_cache()
+        return records
+
+    def write(self, vals):
+        res = super().write(vals)
+        if {'name', 'country_id', 'sub_region_id'}.intersection(vals):
+            self.env['gt.territorial.division']._clear_hierarchy_cache()
+        if 'sub_region_id' in vals:
+            self.env['gt.region.recompute']._enqueue(self)
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env['gt.territorial.division']._clear_hierarchy_cache()
+        return res
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields, api, models
+
+from .account_move import INVOICE_RATES_CACHE_KEY
+
+
+class ResCurrencyRateInherited(models.Model):
+    """Invalida las tasas de cambio de facturas resueltas en la transacción (account.move._get_invoice_currency_rates)
+        y encola la actualización de los montos según tasa de cambio de los documentos de la fecha de la tasa
+        (gt.fx.rate.queue) al crear, modificar o eliminar tasas de cambio."""
+    _inherit = 'res.currency.rate'
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        rates = super().create(vals_list)
+        self.env.cr.cache.pop(INVOICE_RATES_CACHE_KEY, None)
+        self.env['gt.fx.rate.queue']._enqueue(rates._get_currency_dates())
+        return rates
+
+    def write(self, vals):
+        currency_dates = self._get_currency_dates()
+        res = super().write(vals)
+        self.env.cr.cache.pop(INVOICE_RATES_CACHE_KEY, None)
+        self.env['gt.fx.rate.queue']._enqueue(currency_dates + self._get_currency_dates())
+        return res
+
+    def unlink(self):
+        currency_dates = self._get_currency_dates()
+        res = super().unlink()
+        self.env.cr.cache.pop(INVOICE_RATES_CACHE_KEY, None)
+        self.env['gt.fx.rate.queue']._enqueue(currency_dates)
+        return res
+
+    def _get_currency_dates(self):
+        return [(rate.currency_id.id, rate.name) for rate in self]
+
+
+class GTFxRateQueue(models.Model):
+    """Tasas de cambio modificadas pendientes de aplicar a los montos según tasa de cambio de los documentos. Una tasa
+        de la moneda de la compañía afecta a todos los documentos de esa fecha de las compañías con esa moneda, por lo
+        que la actualización se realiza en la acción planificada (account.move._cron_backfill_fx_amounts) y no en la
+        transacción que importa o modifica las tasas.
+    """
+    _name = 'gt.fx.rate.queue'
+    _description = 'Cola de actualización de montos según tasa de cambio'
+    _log_access = False
+
+    currency_id = fields.Many2one('res.currency', string="Moneda", required=True, ondelete='cascade')
+    date = fields.Date(string="Fecha", required=True)
+
+    @api.model
+    def _enqueue(self, currency_dates):
+        """
+        :param currency_dates: iterable of tuple (currency_id, fecha de la tasa)
+        """
+        currency_dates = [key for key in set(currency_dates) if all(key)]
+        if not currency_dates:
+            return
+        self.env.cr.execute("""
+            INSERT INTO gt_fx_rate_queue (currency_id, date)
+                 SELECT * FROM unnest(%s::int[], %s::date[])
+        """, [[key[0] for key in currency_dates], [key[1] for key in currency_dates]])
+        self.env.ref('l10n_gt_inteligos.ir_cron_backfill_fx_amounts')._trigger()
+
+    @api.model
+    def _pop(self, limit):
+        """
+        Retira de la cola hasta ``limit`` tasas, sin esperar por las bloqueadas por otra transacción.
+        :return: set of tuple (currency_id, fecha de la tasa)
+        """
+        self.env.cr.execute("""
+            DELETE FROM gt_fx_rate_queue
+             WHERE id IN (SELECT id FROM gt_fx_rate_queue ORDER BY id LIMIT %s FOR UPDATE SKIP LOCKED)
+         RETURNING currency_id, date
+        """, [limit])
+        return set(self.env.cr.fetchall())
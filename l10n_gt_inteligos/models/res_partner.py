@@ -1,37 +1,48 @@
 # -*- coding: utf-8 -*-
 
-import requests
+import logging
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from xml.etree.ElementTree import fromstring, ElementTree
 
-from odoo import fields, api, models
+from odoo import fields, api, models, _
 from odoo.exceptions import ValidationError
-from odoo.tools import config
+from odoo.osv.expression import OR
+from odoo.tools import config, create_index, ormcache
+from odoo.tools.sql import column_exists, create_column
+
+from ..tools.fel_client import FEL_RECEPTOR_URL, FelServiceUnavailable, get_fel_client
+from ..tools.nit import is_valid_cui, is_valid_nit, normalize_nit, normalize_nit_sql
+
+_logger = logging.getLogger(__name__)
 
 
 class ResPartnerInherited(models.Model):
     _inherit = 'res.partner'
 
-    legal_name = fields.Char(string="Razón Social")
+    legal_name = fields.Char(string="Razón Social", index='trigram')
     vat = fields.Char(string="NIT", default='CF')
+    nit_normalized = fields.Char(
+        compute='_compute_nit_normalized', store=True, index=True,
+        string="NIT normalizado",
+        help='NIT sin guiones ni espacios y en mayúsculas, utilizado para las búsquedas por NIT.'
+    )
+    nit_search = fields.Char(
+        compute='_compute_nit_search', search='_search_nit_search',
+        string="NIT (búsqueda)"
+    )
     company_id = fields.Many2one(
         comodel_name='res.company',
         default=lambda self: self.env.company
     )
     property_account_payable_id = fields.Many2one(
         comodel_name='account.account',
-        default=lambda self: self.env['account.account'].search(
-            [('account_type', '=', 'liability_payable'),
-             ('deprecated', '=', False),
-             ('company_ids', 'in', self.env.company.id)],
-            limit=1, order='code asc')
+        default=lambda self: self._get_gt_default_account('liability_payable')
     )
     property_account_receivable_id = fields.Many2one(
         comodel_name='account.account',
-        default=lambda self: self.env['account.account'].search(
-            [('account_type', '=', 'asset_receivable'),
-             ('deprecated', '=', False),
-             ('company_ids', 'in', self.env.company.id)],
-            limit=1, order='code asc')
+        default=lambda self: self._get_gt_default_account('asset_receivable')
     )
 
     # G_territorial_division fields
@@ -47,14 +58,12 @@ class ResPartnerInherited(models.Model):
     )
     sub_region_id = fields.Many2one(
         comodel_name="gt.sub_region",
-        related='state_id.sub_region_id',
-        depends=['state_id', 'state_id.sub_region_id'],
+        compute='_compute_gt_regions',
         store=True, string="Sub-región"
     )
     region_id = fields.Many2one(
         comodel_name="gt.region",
-        related='state_id.sub_region_id.region_id',
-        depends=['state_id', 'state_id.sub_region_id'],
+        compute='_compute_gt_regions',
         store=True, string="Región"
     )
     zone_partner_id = fields.Many2one(
@@ -63,55 +72,334 @@ class ResPartnerInherited(models.Model):
         copy=False,
         string="Zone"
     )
+    nit_verification_date = fields.Datetime(
+        copy=False,
+        readonly=True,
+        string="Fecha verificación NIT",
+        help='Fecha en que el NIT fue verificado en el servicio web de la SAT.'
+    )
+    nit_verification_error = fields.Char(
+        copy=False,
+        readonly=True,
+        string="Mensaje verificación NIT"
+    )
+
+    def _auto_init(self):
+        """Creación y llenado por SQL de la columna nit_normalized para evitar su cálculo
+            registro por registro a través del ORM al instalar o actualizar el módulo."""
+        if not column_exists(self.env.cr, self._table, 'nit_normalized'):
+            create_column(self.env.cr, self._table, 'nit_normalized', 'varchar')
+            self.env.cr.execute("UPDATE res_partner SET nit_normalized = %s WHERE vat IS NOT NULL"
+                                % normalize_nit_sql('vat'))
+        return super()._auto_init()
+
+    def init(self):
+        super().init()
+        # Índice parcial que soporta la validación de NIT duplicados en _check_vat_unique
+        create_index(self.env.cr, 'res_partner_gt_vat_unique_index', self._table,
+                     ['company_id', 'country_id', 'vat', 'legal_name'],
+                     where="parent_id IS NULL AND vat <> 'CF'")
+        # Índice de trigramas para la búsqueda por subcadena de NIT (_search_nit_search)
+        if self.env.registry.has_trigram:
+            create_index(self.env.cr, '%s_gt_nit_normalized_trgm_index' % self._table, self._table,
+                         ['nit_normalized gin_trgm_ops'], method='gin')
+
+    @api.depends('vat')
+    def _compute_nit_normalized(self):
+        for record in self:
+            record.nit_normalized = normalize_nit(record.vat) or False
+
+    @api.depends('vat')
+    def _compute_nit_search(self):
+        for record in self:
+            record.nit_search = record.vat
+
+    def _search_nit_search(self, operator, value):
+        """Búsqueda por NIT normalizando el valor ingresado para utilizar los índices de nit_normalized: igualdad,
+            subcadena (like/ilike, con el índice de trigramas) o patrón (=like/=ilike). nit_normalized está en
+            mayúsculas, por lo que las búsquedas no distinguen mayúsculas."""
+        if operator in ('=', 'like', 'ilike', '=like', '=ilike') and value and isinstance(value, str):
+            nit = normalize_nit(value)
+            if operator in ('like', 'ilike'):
+                return [('nit_normalized', 'like', nit)]
+            return [('nit_normalized', '=' if operator == '=' else '=like', nit)]
+        return [('vat', operator, value)]
+
+    @api.model
+    def _search_display_name(self, operator, value):
+        """Extensión de la búsqueda por nombre para incluir el NIT normalizado y la razón social."""
+        domain = super()._search_display_name(operator, value)
+        if operator in ('like', 'ilike', '=like', '=ilike', '=') and value and isinstance(value, str):
+            domain = OR([domain, self._search_nit_search(operator, value), [('legal_name', 'ilike', value)]])
+        return domain
 
     @api.constrains('vat')
     def _check_vat_unique(self):
-        if self.env.company.account_fiscal_country_id.code == 'GT':
-            for record in self:
-                duplicate_nit = record.env.company.duplicate_nit
-
-                if record.parent_id or not record.vat or record.vat == 'CF':
-                    continue
-                test_condition = (config['test_enable'] and not self.env.context.get('test_vat'))
-                if test_condition:
-                    continue
-                results = self.env['res.partner'].search_count([
-                    ('parent_id', '=', False),
-                    ('vat', '=', record.vat),
-                    ('legal_name', '=', record.legal_name),
-                    ('id', '!=', record.id),
-                    ('company_id', '=', record.env.company.id),
-                    ('country_id', '=', record.country_id.id)
-                ])
-
-                if results and not duplicate_nit:
-                    raise ValidationError("El número de NIT %s ya existe." + record.vat)
+        """Validación de NIT duplicados para todo el recordset en una sola consulta."""
+        company = self.env.company
+        if company.account_fiscal_country_id.code != 'GT' or company.duplicate_nit:
+            return
+        test_condition = (config['test_enable'] and not self.env.context.get('test_vat'))
+        if test_condition:
+            return
+        partners = self.filtered(lambda r: not r.parent_id and r.vat and r.vat != 'CF')
+        if not partners:
+            return
+        self.flush_model(['vat', 'legal_name', 'parent_id', 'company_id', 'country_id'])
+        # Comparación por igualdad para utilizar res_partner_gt_vat_unique_index en todas sus columnas;
+        # los contactos sin país o sin razón social se resuelven en ramas separadas
+        self.env.cr.execute("""
+            WITH partner AS (
+                SELECT id, country_id, vat, COALESCE(legal_name, '') AS legal_name
+                  FROM res_partner
+                 WHERE id IN %(partner_ids)s
+            ), other AS NOT MATERIALIZED (
+                SELECT id, country_id, vat, legal_name
+                  FROM res_partner
+                 WHERE company_id = %(company_id)s AND parent_id IS NULL AND vat <> 'CF'
+            )
+            (SELECT partner.vat
+               FROM partner
+               JOIN other
+                 ON other.country_id = partner.country_id
+                AND other.vat = partner.vat
+                AND other.legal_name = partner.legal_name
+                AND other.id != partner.id
+              WHERE partner.legal_name != ''
+              LIMIT 1)
+            UNION ALL
+            (SELECT partner.vat
+               FROM partner
+               JOIN other
+                 ON other.country_id = partner.country_id
+                AND other.vat = partner.vat
+                AND COALESCE(other.legal_name, '') = ''
+                AND other.id != partner.id
+              WHERE partner.legal_name = ''
+              LIMIT 1)
+            UNION ALL
+            (SELECT partner.vat
+               FROM partner
+               JOIN other
+                 ON other.country_id IS NULL
+                AND other.vat = partner.vat
+                AND COALESCE(other.legal_name, '') = partner.legal_name
+                AND other.id != partner.id
+              WHERE partner.country_id IS NULL
+              LIMIT 1)
+            LIMIT 1
+        """, {'company_id': company.id, 'partner_ids': tuple(partners.ids)})
+        duplicate = self.env.cr.fetchone()
+        if duplicate:
+            raise ValidationError("El número de NIT %s ya existe." % duplicate[0])
+
+    @api.constrains('vat', 'l10n_latam_identification_type_id')
+    def _check_gt_nit(self):
+        """Validación local del dígito verificador de NIT y CUI, sin consultar el servicio web de la SAT."""
+        if self.env.company.account_fiscal_country_id.code != 'GT':
+            return
+        if config['test_enable'] and not self.env.context.get('test_vat'):
+            return
+        cui_type = self.env.ref('l10n_gt_inteligos.it_cui', raise_if_not_found=False)
+        for record in self:
+            if not record.vat or record.vat == 'CF':
+                continue
+            identification_type = record.l10n_latam_identification_type_id
+            if cui_type and identification_type == cui_type:
+                if not is_valid_cui(record.vat):
+                    raise ValidationError('El CUI %s no es válido.' % record.vat)
+            elif self._is_gt_nit_identification(identification_type, record.country_id):
+                if not is_valid_nit(record.vat):
+                    raise ValidationError('El NIT %s no es válido, verifique el dígito verificador.' % record.vat)
+
+    @api.model
+    def _is_gt_nit_identification(self, identification_types, countries):
+        """Indica si el número de identificación debe tratarse como un NIT de Guatemala
+            para los tipos de identificación y países indicados (vacíos se consideran NIT de Guatemala)."""
+        return all(identification_types.mapped('is_vat')) and all(
+            code == 'GT' for code in countries.mapped('code'))
+
+    @api.model
+    def _get_gt_default_account(self, account_type):
+        """Cuenta predeterminada de la compañía actual para el tipo de cuenta indicado."""
+        return self.env['account.account'].browse(
+            self._get_gt_default_account_id(self.env.company.id, account_type))
+
+    @api.model
+    @ormcache('company_id', 'account_type')
+    def _get_gt_default_account_id(self, company_id, account_type):
+        """Búsqueda cacheada por compañía y tipo de cuenta, invalidada desde account.account sólo cuando la cuenta
+            creada, modificada o eliminada puede cambiar el resultado (account.account._gt_affects_default_account)."""
+        return self.env['account.account'].sudo().search(
+            [('account_type', '=', account_type),
+             ('deprecated', '=', False),
+             ('company_ids', 'in', company_id)],
+            limit=1, order='code asc').id
+
+    @api.model
+    def _get_fel_client(self):
+        """Cliente compartido para el servicio de receptores FEL, configurable por parámetros del sistema."""
+        get_param = self.env['ir.config_parameter'].sudo().get_param
+        return get_fel_client(
+            url=get_param('l10n_gt_inteligos.fel_receptor_url', FEL_RECEPTOR_URL),
+            emisor_codigo=get_param('l10n_gt_inteligos.fel_emisor_codigo', '101529643'),
+            emisor_clave=get_param('l10n_gt_inteligos.fel_emisor_clave', 'CEFD1D3A74F08D2A3979CAB404DF1E59'),
+            connect_timeout=float(get_param('l10n_gt_inteligos.fel_connect_timeout', 3.05)),
+            read_timeout=float(get_param('l10n_gt_inteligos.fel_read_timeout', 10)),
+            retries=int(get_param('l10n_gt_inteligos.fel_retries', 2)),
+        )
 
     @api.model
     def search_legal_name_by_nit(self, nit, name):
         """Consulta de razón social por medio de NIT ingresado.
                 Verificación de la razón social en el servicio web de la SAT.
+                Los resultados se guardan en gt.nit.cache y sólo se consulta el servicio
+                cuando el NIT no existe en la caché o su resultado ya venció.
+                Si el servicio no está disponible se devuelve el nombre ingresado.
             """
         if nit != 'CF' and self.env.company.account_fiscal_country_id.code == 'GT':
-            url = 'https://consultareceptores.feel.com.gt/rest/action'
-            headers = {'Content-Type': 'application/json'}
-            data = {
-                "emisor_codigo": '101529643',
-                "emisor_clave": 'CEFD1D3A74F08D2A3979CAB404DF1E59',
-                "nit_consulta": nit.replace("-", "")
-            }
-            resp = requests.post(url=url, json=data, headers=headers)
-            result = resp.json()
+            if not is_valid_nit(nit):
+                raise ValidationError('El NIT %s no es válido, verifique el dígito verificador.' % nit)
+            nit_cache = self.env['gt.nit.cache']
+            cached = nit_cache._get_cached_result(nit)
+            if cached:
+                if cached.error_message:
+                    raise ValidationError(cached.error_message)
+                return cached.legal_name or name
+
+            try:
+                result = self._get_fel_client().query_nit(normalize_nit(nit))
+            except FelServiceUnavailable:
+                _logger.warning("SAT FEL service unavailable, using the supplied name for NIT %s", nit)
+                return name
             if result.get('mensaje'):
+                nit_cache._store_error_result(nit, result['mensaje'])
                 raise ValidationError(result['mensaje'])
 
-            raw_name = result.get('nombre')
-            if raw_name:
-                legal_name = " ".join(part for part in raw_name.split(',') if part.strip())
-            else:
-                legal_name = name
+            legal_name = self._parse_fel_legal_name(result)
+            nit_cache._store_result(nit, legal_name=legal_name)
 
-            return legal_name
+            return legal_name or name
+
+    @api.model
+    def _parse_fel_legal_name(self, result):
+        """Obtiene la razón social de la respuesta del servicio de receptores FEL."""
+        raw_name = result.get('nombre')
+        if raw_name:
+            return " ".join(part for part in raw_name.split(',') if part.strip())
+        return False
+
+    @api.model
+    def verify_nits_batch(self, partner_ids, max_workers=None):
+        """
+        Verificación masiva de NITs en el servicio web de la SAT, pensada para importaciones de contactos.
+        Los NITs se deduplican, se resuelven primero desde gt.nit.cache y los restantes se consultan
+        de forma concurrente con un pool de hilos acotado. La razón social se escribe agrupando
+        los contactos por resultado.
+        :param partner_ids: list of int ids de res.partner a verificar
+        :param max_workers: int número máximo de consultas concurrentes
+        :return: dict con el resumen de la verificación
+        """
+        start = time.monotonic()
+        nit_cache = self.env['gt.nit.cache']
+        partners = self.browse(partner_ids).filtered(lambda p: not p.parent_id and p.vat and p.vat != 'CF')
+        partners_by_nit = defaultdict(lambda: self.browse())
+        for partner in partners:
+            partners_by_nit[normalize_nit(partner.vat)] |= partner
+
+        # Los NITs con dígito verificador inválido se descartan sin consultar a la SAT
+        results = {
+            nit: (False, 'El NIT %s no es válido, verifique el dígito verificador.' % nit)
+            for nit in partners_by_nit if not is_valid_nit(nit)
+        }
+        cached_results = nit_cache._get_cached_results([nit for nit in partners_by_nit if nit not in results])
+        for nit, entry in cached_results.items():
+            results[nit] = (entry.legal_name, entry.error_message)
+        cached_count = len(cached_results)
+
+        pending = [nit for nit in partners_by_nit if nit not in results]
+        failures = {}
+        if pending:
+            if max_workers is None:
+                max_workers = int(self.env['ir.config_parameter'].sudo().get_param(
+                    'l10n_gt_inteligos.nit_verify_workers', 8))
+            client = self._get_fel_client()
+            # Los hilos sólo realizan las consultas HTTP, el ORM se utiliza únicamente en el hilo actual
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(client.query_nit, nit): nit for nit in pending}
+                for future in as_completed(futures):
+                    nit = futures[future]
+                    try:
+                        result = future.result()
+                    except FelServiceUnavailable as e:
+                        failures[nit] = str(e)
+                        continue
+                    if result.get('mensaje'):
+                        results[nit] = (False, result['mensaje'])
+                    else:
+                        results[nit] = (self._parse_fel_legal_name(result), False)
+            nit_cache._store_results([(nit,) + results[nit] for nit in pending if nit in results])
+
+        now = fields.Datetime.now()
+        to_write = defaultdict(lambda: self.browse())
+        for nit, (legal_name, error_message) in results.items():
+            to_write[(legal_name or False, error_message or False)] |= partners_by_nit[nit]
+        for (legal_name, error_message), group in to_write.items():
+            vals = {'nit_verification_date': now, 'nit_verification_error': error_message}
+            if legal_name:
+                vals['legal_name'] = legal_name
+            group.write(vals)
+
+        duration = time.monotonic() - start
+        summary = {
+            'partners': len(partners),
+            'nits': len(partners_by_nit),
+            'cached': cached_count,
+            'queried': len(pending),
+            'verified': len([r for r in results.values() if not r[1]]),
+            'invalid': {nit: r[1] for nit, r in results.items() if r[1]},
+            'failed': failures,
+            'duration': duration,
+            'throughput': len(partners_by_nit) / duration if duration else 0.0,
+        }
+        _logger.info(
+            "NIT batch verification: %(partners)s partners, %(nits)s NITs (%(cached)s cached, %(queried)s queried), "
+            "%(verified)s verified in %(duration).2fs (%(throughput).1f NIT/s)", summary)
+        if failures:
+            _logger.warning("NIT batch verification: %s NITs could not be verified", len(failures))
+        return summary
+
+    def action_verify_nits(self):
+        """Acción para verificar en la SAT los NITs de los contactos seleccionados."""
+        summary = self.verify_nits_batch(self.ids)
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'type': 'warning' if summary['failed'] or summary['invalid'] else 'success',
+                'message': _("%(verified)s NITs verificados, %(invalid)s inválidos y %(failed)s sin respuesta "
+                             "de la SAT.", verified=summary['verified'], invalid=len(summary['invalid']),
+                             failed=len(summary['failed'])),
+                'sticky': False,
+            }
+        }
+
+    @api.model
+    def _cron_verify_nits(self, batch_size=1000):
+        """Acción planificada: verifica en la SAT los NITs de los contactos de Guatemala pendientes de verificar."""
+        partners = self.search([
+            ('nit_verification_date', '=', False),
+            ('parent_id', '=', False),
+            ('vat', '!=', False),
+            ('vat', '!=', 'CF'),
+            ('country_id.code', '=', 'GT'),
+        ], limit=batch_size)
+        if not partners:
+            return
+        summary = self.verify_nits_batch(partners.ids)
+        # Si la SAT no respondió se espera a la siguiente ejecución programada
+        if len(partners) == batch_size and not summary['failed']:
+            self.env.ref('l10n_gt_inteligos.ir_cron_verify_nits')._trigger()
 
     @api.onchange('vat')
     def _onchange_vat(self):
@@ -120,22 +408,52 @@ class ResPartnerInherited(models.Model):
 
             if not self.vat == 'CF' and self.l10n_latam_identification_type_id.is_vat:
                 if self.vat:
-                    legal_name = self.search_legal_name_by_nit(self.vat, self.name)
+                    nit = normalize_nit(self.vat)
+                    if not is_valid_nit(nit):
+                        raise ValidationError('El NIT %s no es válido, verifique el dígito verificador.' % self.vat)
+                    if self.vat != nit:
+                        self.vat = nit
+                    legal_name = self.search_legal_name_by_nit(nit, self.name)
                     self.legal_name = legal_name
                 else:
                     raise ValidationError('Valor ingresado para NIT no es válido. Ingréselo un NIT por favor.')
 
     def write(self, vals):
         """Herencia al método genérico write para llenar el campo razón social
-            en los contactos que no tienen razón social ingresada"""
+            en los contactos que no tienen razón social ingresada.
+            Los contactos se agrupan según la razón social que recibirán y se realiza
+            una sola escritura por grupo."""
         # changegt
         if self.env.company.account_fiscal_country_id.code == 'GT':
+            if vals.get('vat') and vals['vat'] != 'CF':
+                identification_types = self.env['l10n_latam.identification.type'].browse(
+                    vals['l10n_latam_identification_type_id']) if vals.get('l10n_latam_identification_type_id') \
+                    else self.l10n_latam_identification_type_id
+                country = self.env['res.country'].browse(vals['country_id']) if vals.get('country_id') \
+                    else self.country_id
+                if self._is_gt_nit_identification(identification_types, country):
+                    vals['vat'] = normalize_nit(vals['vat'])
 
-            for record in self:
-                if not record.legal_name and not vals.get('legal_name', False):
-                    vals['legal_name'] = record.browse(record.parent_id.id).legal_name or record.browse(
-                        record.parent_id.id).name \
-                        if record.parent_id else record.name
+            to_fill = self.filtered(lambda r: not r.legal_name) if not vals.get('legal_name') else self.browse()
+            if to_fill:
+                if 'parent_id' in vals:
+                    parents = self.browse(vals['parent_id'])
+                else:
+                    parents = to_fill.parent_id
+                # Lectura de todos los contactos padre en una sola consulta
+                parents.fetch(['legal_name', 'name'])
+                records_by_legal_name = defaultdict(lambda: self.browse())
+                for record in to_fill:
+                    parent = parents if 'parent_id' in vals else record.parent_id
+                    legal_name = parent.legal_name or parent.name if parent else vals.get('name') or record.name
+                    records_by_legal_name[legal_name] |= record
+
+                others = self - to_fill
+                if others:
+                    super(ResPartnerInherited, others).write(vals)
+                for legal_name, records in records_by_legal_name.items():
+                    super(ResPartnerInherited, records).write(dict(vals, legal_name=legal_name))
+                return True
         res = super(ResPartnerInherited, self).write(vals)
         return res
 
@@ -148,7 +466,16 @@ class ResPartnerInherited(models.Model):
         """
         # changegt
         if self.env.company.account_fiscal_country_id.code == 'GT':
+            # Lectura de todos los contactos padre en una sola consulta
+            self.browse(list({
+                vals['parent_id'] for vals in vals_list if vals.get('parent_id') and not vals.get('legal_name')
+            })).fetch(['legal_name'])
             for vals in vals_list:
+                if vals.get('vat') and vals['vat'] != 'CF' and self._is_gt_nit_identification(
+                        self.env['l10n_latam.identification.type'].browse(
+                            vals.get('l10n_latam_identification_type_id')),
+                        self.env['res.country'].browse(vals.get('country_id'))):
+                    vals['vat'] = normalize_nit(vals['vat'])
                 if not vals.get('legal_name', False):
                     vals['legal_name'] = self.browse(vals['parent_id']).legal_name \
                         if vals.get('parent_id', False) else vals.get('name', 'Ingresar una razón social.')
@@ -156,13 +483,21 @@ class ResPartnerInherited(models.Model):
         return res
 
     # gt_territorial_division methods
+    # Los cambios en la jerarquía (sub-región del departamento o región de la sub-región) no se recalculan
+    # por el ORM, se actualizan en segundo plano mediante gt.region.recompute
+    @api.depends('state_id')
+    def _compute_gt_regions(self):
+        territorial_division = self.env['gt.territorial.division']
+        for record in self:
+            record.sub_region_id, record.region_id = territorial_division._get_state_regions(record.state_id.id)
+
     @api.onchange('county_id')
     def _onchange_county(self):
         if self.env.company.account_fiscal_country_id.code == 'GT':
             if self.county_id:
-                self.country_id = self.county_id.state_id.country_id.id \
-                    if self.county_id.state_id and self.county_id.state_id.country_id else False
-                self.state_id = self.county_id.state_id.id if self.county_id.state_id else False
+                state_id, country_id = self.env['gt.territorial.division']._get_county_location(self.county_id.id)
+                self.country_id = country_id
+                self.state_id = state_id
 
     @api.model
     def _address_fields(self):
@@ -176,7 +511,7 @@ class ResPartnerInherited(models.Model):
         """Herencia del método para agregar nuevo valor a los args 'county_name' para el formato de dirección."""
         address_format, args = super(ResPartnerInherited, self)._prepare_display_address(without_company)
         if self.env.company.account_fiscal_country_id.code == 'GT':
-            args.update({'county_name': self.county_id.name})
+            args.update({'county_name': self.env['gt.territorial.division']._get_county_name(self.county_id.id)})
             for key in args.keys():
                 if not args.get(key, False):
                     address_format.replace('%(' + key + ')s,', '%(' + key + ')s')
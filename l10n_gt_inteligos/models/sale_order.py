@@ -2,6 +2,7 @@
 
 from odoo.models import Model
 from odoo.fields import Many2one
+from odoo.api import depends
 
 
 class SaleOrderInherit(Model):
@@ -14,39 +15,36 @@ class SaleOrderInherit(Model):
     # gt_territorial_division fields
     sub_region_invoice_id = Many2one(
         comodel_name="gt.sub_region",
-        related='partner_invoice_id.state_id.sub_region_id',
-        depends=[
-            'partner_invoice_id.state_id',
-            'partner_invoice_id.state_id.sub_region_id'
-        ],
+        compute='_compute_gt_invoice_regions',
         store=True, string="Sub-región de factura"
     )
     region_invoice_id = Many2one(
         comodel_name="gt.region",
-        related='partner_invoice_id.state_id.sub_region_id.region_id',
-        depends=[
-            'partner_invoice_id.state_id',
-            'partner_invoice_id.state_id.sub_region_id',
-            'sub_region_invoice_id'
-        ],
+        compute='_compute_gt_invoice_regions',
         store=True, string="Región de factura"
     )
     sub_region_shipping_id = Many2one(
         comodel_name="gt.sub_region",
-        related='partner_shipping_id.state_id.sub_region_id',
-        depends=[
-            'partner_shipping_id.state_id',
-            'partner_shipping_id.state_id.sub_region_id'
-        ],
+        compute='_compute_gt_shipping_regions',
         store=True, string="Sub-región de entrega"
     )
     region_shipping_id = Many2one(
         comodel_name="gt.region",
-        related='partner_shipping_id.state_id.sub_region_id.region_id',
-        depends=[
-            'partner_shipping_id.state_id',
-            'partner_shipping_id.state_id.sub_region_id',
-            'sub_region_shipping_id'
-        ],
+        compute='_compute_gt_shipping_regions',
         store=True, string="Región de entrega"
     )
+
+    # Los cambios en la jerarquía territorial se actualizan en segundo plano mediante gt.region.recompute
+    @depends('partner_invoice_id.state_id')
+    def _compute_gt_invoice_regions(self):
+        territorial_division = self.env['gt.territorial.division']
+        for order in self:
+            order.sub_region_invoice_id, order.region_invoice_id = territorial_division._get_state_regions(
+                order.partner_invoice_id.state_id.id)
+
+    @depends('partner_shipping_id.state_id')
+    def _compute_gt_shipping_regions(self):
+        territorial_division = self.env['gt.territorial.division']
+        for order in self:
+            order.sub_region_shipping_id, order.region_shipping_id = territorial_division._get_state_regions(
+                order.partner_shipping_id.state_id.id)
@@ -1,8 +1,9 @@
 # -*- coding: utf-8 -*-
 
-import re
 from odoo.models import AbstractModel
 
+from ..tools.sequence import parse_sequence_regex
+
 
 class SequenceMixin(AbstractModel):
     _inherit = 'sequence.mixin'
@@ -19,7 +20,8 @@ class SequenceMixin(AbstractModel):
         elif sequence_number_reset == 'month':
             regex = self._sequence_monthly_regex
 
-        format_values = re.match(regex, previous).groupdict()
+        pattern, format = parse_sequence_regex(regex)
+        format_values = pattern.match(previous).groupdict()
         format_values['seq_length'] = len(format_values['seq'])
         format_values['year_length'] = len(format_values.get('year') or '')
         format_values['year_end_length'] = len(format_values.get('year_end') or '')
@@ -34,13 +36,4 @@ class SequenceMixin(AbstractModel):
         for field in ('seq', 'year', 'month', 'year_end'):
             format_values[field] = int(format_values.get(field) or 0)
 
-        placeholders = re.findall(r'\b(prefix\d|seq|suffix\d?|year|year_end|month)\b', regex)
-        format = ''.join(
-            "{seq:0{seq_length}d}" if s == 'seq' else
-            "{month:02d}" if s == 'month' else
-            "{year:0{year_length}d}" if s == 'year' else
-            "{year_end:0{year_end_length}d}" if s == 'year_end' else
-            "{%s}" % s
-            for s in placeholders
-        )
         return format, format_values
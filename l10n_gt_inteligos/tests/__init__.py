@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+
+from . import test_account_move_batch
+from . import test_amount_words
+from . import test_cron
+from . import test_fel_client
+from . import test_nit
+from . import test_verify_nits
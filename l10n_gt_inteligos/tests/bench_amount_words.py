@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark de la conversión de montos a letras (tools/amount_words.py), independiente de Odoo.
+
+    python l10n_gt_inteligos/tests/bench_amount_words.py [cantidad]
+
+    Compara, sobre montos con distribución log-normal en es_GT, la implementación anterior de
+    convert_amount_in_words (búsqueda lineal del idioma, monto formateado como texto y num2words también para los
+    centavos) con amounts_to_words, con la caché de la parte entera vacía y llena. Verifica que el texto es el mismo.
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import time
+
+from num2words import num2words
+
+_spec = importlib.util.spec_from_file_location(
+    'gt_amount_words',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tools', 'amount_words.py'))
+amount_words = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(amount_words)
+
+LIST_LANG = [['en', 'en_US'], ['en', 'en_AU'], ['en', 'en_GB'], ['en', 'en_IN'],
+             ['fr', 'fr_BE'], ['fr', 'fr_CA'], ['fr', 'fr_CH'], ['fr', 'fr_FR'],
+             ['es', 'es_ES'], ['es', 'es_AR'], ['es', 'es_BO'], ['es', 'es_CL'], ['es', 'es_CO'],
+             ['es', 'es_CR'], ['es', 'es_DO'],
+             ['es', 'es_EC'], ['es', 'es_GT'], ['es', 'es_MX'], ['es', 'es_PA'], ['es', 'es_PE'],
+             ['es', 'es_PY'], ['es', 'es_UY'], ['es', 'es_VE'],
+             ['lt', 'lt_LT'], ['lv', 'lv_LV'], ['no', 'nb_NO'], ['pl', 'pl_PL'], ['ru', 'ru_RU'],
+             ['dk', 'da_DK'], ['pt_BR', 'pt_BR'], ['de', 'de_DE'], ['de', 'de_CH'],
+             ['ar', 'ar_SY'], ['it', 'it_IT'], ['he', 'he_IL'], ['id', 'id_ID'], ['tr', 'tr_TR'],
+             ['nl', 'nl_NL'], ['nl', 'nl_BE'], ['uk', 'uk_UA'], ['sl', 'sl_SI'], ['vi_VN', 'vi_VN']]
+
+
+def amount_to_words_original(amount, language, currency_label, separator, lang):
+    """Implementación anterior de account.move.convert_amount_in_words."""
+    for rec in LIST_LANG:
+        if rec[1] == lang:
+            language = rec[0]
+
+    amount_str = str('{:2f}'.format(amount))
+    amount_str_splt = amount_str.split('.')
+    before_point_value = amount_str_splt[0]
+    after_point_value = amount_str_splt[1][:2]
+
+    before_amount_words = num2words(int(before_point_value), lang=language)
+    num2words(int(after_point_value), lang=language)
+
+    amount = before_amount_words
+    if currency_label:
+        amount += ' ' + currency_label
+    if separator:
+        amount += ' ' + separator
+    if int(after_point_value) > 0:
+        amount += ' con ' + str(after_point_value) + '/100.'
+    else:
+        amount += ' exactos.'
+    return amount
+
+
+def sample_amounts(count, seed=42):
+    rng = random.Random(seed)
+    return [(round(rng.lognormvariate(7, 1.5), 2), 'Quetzales', None, 'es_GT') for _i in range(count)]
+
+
+def measure(label, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print("%s: %d, %.2fs (%.0f/s)" % (label, len(result), elapsed, len(result) / elapsed))
+    return result
+
+
+def main(count=100000):
+    amounts = sample_amounts(count)
+    original = measure("Original", lambda: [
+        amount_to_words_original(amount, 'es', currency_label, separator, lang)
+        for amount, currency_label, separator, lang in amounts
+    ])
+    amount_words.integer_to_words.cache_clear()
+    cold = measure("Caché vacía", lambda: amount_words.amounts_to_words(amounts))
+    warm = measure("Caché llena", lambda: amount_words.amounts_to_words(amounts))
+    print("Montos enteros distintos: %d" % amount_words.integer_to_words.cache_info().currsize)
+    assert original == cold == warm, "El texto difiere de la implementación anterior"
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
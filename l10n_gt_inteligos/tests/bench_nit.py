@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark de la validación local de NIT (tools/nit.py), independiente de Odoo.
+
+    python l10n_gt_inteligos/tests/bench_nit.py [cantidad]
+
+    Mide is_valid_nit() sobre NITs aleatorios, válidos en su mayoría y con un 10% de dígitos verificadores
+    alterados, y sobre CUIs válidos, que se validan después de descartar el formato de NIT.
+"""
+
+import importlib.util
+import os
+import random
+import sys
+import time
+
+_spec = importlib.util.spec_from_file_location(
+    'gt_nit', os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tools', 'nit.py'))
+nit_tools = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(nit_tools)
+
+
+def sample_nits(count, seed=42):
+    rng = random.Random(seed)
+    nits = []
+    for _i in range(count):
+        body = str(rng.randrange(10 ** 5, 10 ** 9))
+        check = nit_tools._nit_check_digit(body)
+        if rng.random() < 0.1:
+            check = '0' if check != '0' else '1'
+        nits.append('%s-%s' % (body, check))
+    return nits
+
+
+def sample_cuis(count, seed=42):
+    rng = random.Random(seed)
+    cuis = []
+    while len(cuis) < count:
+        body = '%08d' % rng.randrange(10 ** 8)
+        check = sum(int(char) * weight for weight, char in enumerate(body, start=2)) % 11
+        state = rng.randrange(1, len(nit_tools._COUNTIES_BY_STATE) + 1)
+        county = rng.randrange(1, nit_tools._COUNTIES_BY_STATE[state - 1] + 1)
+        if check < 10:
+            cuis.append('%s%s%02d%02d' % (body, check, state, county))
+    return cuis
+
+
+def measure(label, values):
+    start = time.perf_counter()
+    valid = sum(1 for value in values if nit_tools.is_valid_nit(value))
+    elapsed = time.perf_counter() - start
+    print("%s: %d, %d válidos, %.2fs (%.0f/s)" % (label, len(values), valid, elapsed, len(values) / elapsed))
+
+
+def main(count=1000000):
+    measure("NITs", sample_nits(count))
+    measure("CUIs", sample_cuis(count // 10))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Micro-benchmark del análisis de nombres de secuencia (tools/sequence.py), independiente de Odoo.
+
+    python l10n_gt_inteligos/tests/bench_sequence.py [cantidad]
+
+    Compara, sobre nombres anuales (INV/2026/NNNNN) y mensuales (INV/2026/10/NNNN), el análisis original de
+    sequence.mixin._get_sequence_format_param, que ejecuta re.match sobre la expresión sin compilar y reconstruye el
+    formato con re.findall en cada llamada, con parse_sequence_regex, que guarda el patrón compilado y el formato por
+    expresión. Verifica que ambos producen el mismo formato y los mismos valores.
+"""
+
+import importlib.util
+import os
+import random
+import re
+import sys
+import time
+
+_spec = importlib.util.spec_from_file_location(
+    'gt_sequence', os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'tools', 'sequence.py'))
+sequence_tools = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(sequence_tools)
+
+# Expresiones de sequence.mixin (Odoo 18)
+YEARLY_REGEX = r'^(?P<prefix1>.*?)(?P<year>((?<=\D)|(?<=^))((19|20|21)?\d{2}))(?P<prefix2>\D+?)(?P<seq>\d+)' \
+               r'(?P<suffix>\D*?)$'
+MONTHLY_REGEX = r'^(?P<prefix1>.*?)(?P<year>((?<=\D)|(?<=^))((19|20|21)\d{2}|(\d{2}(?=\D))))(?P<prefix2>\D*?)' \
+                r'(?P<month>(0[1-9]|1[0-2]))(?P<prefix3>\D+?)(?P<seq>\d+)(?P<suffix>\D*?)$'
+
+
+def parse_original(regex, name):
+    format_values = re.match(regex, name).groupdict()
+    placeholders = re.findall(r'\b(prefix\d|seq|suffix\d?|year|year_end|month)\b', regex)
+    format = ''.join(
+        "{seq:0{seq_length}d}" if s == 'seq' else
+        "{month:02d}" if s == 'month' else
+        "{year:0{year_length}d}" if s == 'year' else
+        "{year_end:0{year_end_length}d}" if s == 'year_end' else
+        "{%s}" % s
+        for s in placeholders
+    )
+    return format, format_values
+
+
+def parse_cached(regex, name):
+    pattern, format = sequence_tools.parse_sequence_regex(regex)
+    return format, pattern.match(name).groupdict()
+
+
+def sample_names(count, seed=42):
+    rng = random.Random(seed)
+    yearly = ['INV/%d/%05d' % (rng.randrange(2020, 2030), rng.randrange(1, 10 ** 5)) for _i in range(count)]
+    monthly = ['INV/%d/%02d/%04d' % (rng.randrange(2020, 2030), rng.randrange(1, 13), rng.randrange(1, 10 ** 4))
+               for _i in range(count)]
+    return yearly, monthly
+
+
+def measure(label, parse, regex, names):
+    start = time.perf_counter()
+    results = [parse(regex, name) for name in names]
+    elapsed = time.perf_counter() - start
+    print("%s: %d, %.2fs (%.0f/s)" % (label, len(names), elapsed, len(names) / elapsed))
+    return results
+
+
+def main(count=100000):
+    yearly, monthly = sample_names(count)
+    for label, regex, names in [("Anual", YEARLY_REGEX, yearly), ("Mensual", MONTHLY_REGEX, monthly)]:
+        original = measure("%s, original" % label, parse_original, regex, names)
+        cached = measure("%s, en caché" % label, parse_cached, regex, names)
+        assert original == cached, "El análisis en caché difiere del original"
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Benchmark de publicación concurrente: numeración de serie única contra series por subrangos.
+
+    python l10n_gt_inteligos/tests/bench_sharded_numbering.py -c odoo.conf -d base_datos --journal ID \\
+        [--workers 8] [--moves 50] [--partner ID]
+
+    Requiere una base de datos de prueba con el módulo instalado: crea y publica facturas de cliente reales en el
+    diario de ventas indicado. Para cada modo de numeración (account.journal.gt_numbering_mode) crea workers * moves facturas en
+    borrador y las publica desde ``workers`` procesos en paralelo, una factura por transacción. Reporta documentos
+    por segundo y la latencia de publicación (p50/p95), y verifica que cada serie quede sin saltos.
+"""
+
+import argparse
+import multiprocessing
+import statistics
+import time
+
+import odoo
+from odoo import SUPERUSER_ID, api, fields
+from odoo.modules.registry import Registry
+
+
+def environment(cr):
+    return api.Environment(cr, SUPERUSER_ID, {})
+
+
+def setup(config_file):
+    odoo.tools.config.parse_config(['-c', config_file] if config_file else [])
+
+
+def create_drafts(dbname, journal_id, partner_id, count):
+    with Registry(dbname).cursor() as cr:
+        env = environment(cr)
+        journal = env['account.journal'].browse(journal_id)
+        partner = env['res.partner'].browse(partner_id) if partner_id else env.company.partner_id
+        moves = env['account.move'].create([{
+            'move_type': 'out_invoice',
+            'journal_id': journal.id,
+            'partner_id': partner.id,
+            'invoice_date': fields.Date.context_today(journal),
+            'invoice_line_ids': [(0, 0, {'name': 'Benchmark %s' % index, 'quantity': 1, 'price_unit': 100.0})],
+        } for index in range(count)])
+        return moves.ids
+
+
+def post_worker(config_file, dbname, move_ids, barrier, results):
+    setup(config_file)
+    registry = Registry(dbname)
+    latencies = []
+    barrier.wait()
+    for move_id in move_ids:
+        start = time.perf_counter()
+        with registry.cursor() as cr:
+            environment(cr)['account.move'].browse(move_id).action_post()
+        latencies.append(time.perf_counter() - start)
+    results.put(latencies)
+
+
+def check_series(dbname, move_ids):
+    """:return: dict {serie: cantidad} y la cantidad de series con saltos"""
+    with Registry(dbname).cursor() as cr:
+        moves = environment(cr)['account.move'].browse(move_ids)
+        series = {}
+        for move in moves:
+            series.setdefault(move.invoice_doc_serie, []).append(int(move.invoice_doc_number))
+        gaps = sum(1 for numbers in series.values() if max(numbers) - min(numbers) + 1 != len(numbers))
+        return {serie: len(numbers) for serie, numbers in series.items()}, gaps
+
+
+def run_mode(args, mode):
+    with Registry(args.database).cursor() as cr:
+        environment(cr)['account.journal'].browse(args.journal).write({
+            'gt_numbering_mode': mode,
+            'gt_shard_count': min(args.workers, 26),
+        })
+    move_ids = create_drafts(args.database, args.journal, args.partner, args.workers * args.moves)
+
+    context = multiprocessing.get_context('spawn')
+    barrier = context.Barrier(args.workers + 1)
+    results = context.Queue()
+    processes = [
+        context.Process(target=post_worker, args=(
+            args.config, args.database, move_ids[index::args.workers], barrier, results))
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    barrier.wait()
+    start = time.perf_counter()
+    latencies = []
+    for _process in processes:
+        latencies += results.get()
+    elapsed = time.perf_counter() - start
+    for process in processes:
+        process.join()
+
+    latencies.sort()
+    series, gaps = check_series(args.database, move_ids)
+    print("%-8s %d documentos en %.2fs: %.1f documentos/s, p50 %.0fms, p95 %.0fms, %d series, %d con saltos" % (
+        mode, len(move_ids), elapsed, len(move_ids) / elapsed,
+        statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95)] * 1000, len(series), gaps))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-c', '--config', help="archivo de configuración de Odoo")
+    parser.add_argument('-d', '--database', required=True)
+    parser.add_argument('--journal', type=int, required=True, help="id del diario de ventas")
+    parser.add_argument('--partner', type=int, help="id del cliente; por defecto el de la compañía")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--moves', type=int, default=50, help="documentos por proceso")
+    args = parser.parse_args()
+
+    setup(args.config)
+    with Registry(args.database).cursor() as cr:
+        original_mode = environment(cr)['account.journal'].browse(args.journal).gt_numbering_mode
+    try:
+        for mode in ('single', 'sharded'):
+            run_mode(args, mode)
+    finally:
+        with Registry(args.database).cursor() as cr:
+            environment(cr)['account.journal'].browse(args.journal).gt_numbering_mode = original_mode
+
+
+if __name__ == '__main__':
+    main()
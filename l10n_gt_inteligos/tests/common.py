@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class FelStandInServer:
+    """Servidor HTTP local que simula el servicio de consulta de receptores FEL.
+
+        ``responses`` define la respuesta por NIT como tuple (código HTTP, dict). Una lista de respuestas se
+        consume en orden y la última se repite. Los NITs sin respuesta definida reciben ``default``.
+        Se registran los NITs consultados y la cantidad de conexiones abiertas por los clientes.
+    """
+
+    def __init__(self, default=(200, {'nombre': 'CONTRIBUYENTE,,DE PRUEBA', 'mensaje': ''})):
+        self.default = default
+        self.responses = {}
+        self.requests = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                status, payload = server._next_response(body.get('nit_consulta'))
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.httpd.daemon_threads = True
+        self.url = 'http://127.0.0.1:%s/rest/action' % self.httpd.server_port
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def _next_response(self, nit):
+        with self._lock:
+            self.requests.append(nit)
+            response = self.responses.get(nit, self.default)
+            if isinstance(response, list):
+                response = response.pop(0) if len(response) > 1 else response[0]
+            return response
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
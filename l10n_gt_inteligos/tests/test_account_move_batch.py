@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+
+from odoo import fields
+from odoo.tests import tagged
+
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+
+
+@tagged('post_install', '-at_install')
+class TestAccountMoveBatch(AccountTestInvoicingCommon):
+    """Publicar o anular una selección de documentos GT ejecuta una cantidad acotada de consultas. Sin seguimiento
+        de cambios (tracking_disable), el único trabajo por documento del método genérico _post es suscribir al
+        cliente como seguidor; ese costo se mide y es el único margen permitido entre un lote pequeño y uno grande."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env = cls.env(context=dict(cls.env.context, tracking_disable=True))
+        cls.env.company.account_fiscal_country_id = cls.env.ref('base.gt')
+        # Diario creado como GT, con su secuencia de numeración
+        cls.journal_gt = cls.env['account.journal'].create({
+            'name': 'Facturas GT',
+            'code': 'FGT',
+            'type': 'sale',
+            'company_id': cls.env.company.id,
+        })
+
+    def _create_invoices(self, count, invoice_date=None):
+        return self.env['account.move'].create([{
+            'move_type': 'out_invoice',
+            'journal_id': self.journal_gt.id,
+            'partner_id': self.partner_a.id,
+            'invoice_date': invoice_date,
+            'invoice_line_ids': [(0, 0, {'product_id': self.product_a.id, 'price_unit': 100.0})],
+        } for _index in range(count)])
+
+    def _count_queries(self, func):
+        self.env.flush_all()
+        self.env.invalidate_all()
+        start = self.cr.sql_log_count
+        func()
+        self.env.flush_all()
+        return self.cr.sql_log_count - start
+
+    def _subscribe_partners(self, moves):
+        """Mismo trabajo por documento que el método genérico _post: suscribir al cliente como seguidor."""
+        for invoice in moves:
+            partner_id = invoice.partner_id
+            subscribers = [partner_id.id] if partner_id and partner_id not in invoice.sudo().message_partner_ids \
+                else None
+            invoice.message_subscribe(subscribers)
+
+    def test_post_and_cancel_query_count(self):
+        # Calentamiento: cachés de registro, vistas y secuencias
+        self._create_invoices(2).action_post()
+
+        small = self._create_invoices(5)
+        large = self._create_invoices(50)
+        # Costo real del trabajo por documento del método genérico para los documentos adicionales del lote grande,
+        # medido sobre otros borradores iguales
+        probe = self._create_invoices(len(large) - len(small))
+        generic_extra = self._count_queries(lambda: self._subscribe_partners(probe))
+        small_post = self._count_queries(small.action_post)
+
+        self.env.flush_all()
+        self.env.invalidate_all()
+        with self.assertQueryCount(small_post + generic_extra):
+            large.action_post()
+            self.env.flush_all()
+        self.assertEqual(set(large.mapped('state')), {'posted'})
+        self.assertEqual(len(set(large.mapped('invoice_doc_number'))), len(large))
+
+        small_cancel = self._count_queries(small.button_cancel)
+        self.env.invalidate_all()
+        # La anulación no tiene trabajo por documento: el lote grande ejecuta las mismas consultas que el pequeño
+        with self.assertQueryCount(small_cancel):
+            large.button_cancel()
+            self.env.flush_all()
+        self.assertEqual(set(large.mapped('state')), {'cancel'})
+
+    def test_post_selection_without_dates(self):
+        today = fields.Date.context_today(self.env.user)
+        dated = self._create_invoices(3, invoice_date=today)
+        undated = self._create_invoices(3)
+        (dated | undated).action_post()
+        self.assertEqual(set((dated | undated).mapped('invoice_date')), {today})
+        self.assertEqual([move.date for move in undated], undated.mapped('invoice_date'))
+
+    def test_document_type_lookup_query_count(self):
+        """El tipo de documento predeterminado se resuelve por lote: calcularlo para 1,000 facturas ejecuta las
+            mismas consultas que para 10."""
+        small = self._create_invoices(10)
+        large = self._create_invoices(1000)
+
+        def prepare(moves):
+            self.env.flush_all()
+            self.env.invalidate_all()
+            # Los tipos disponibles se calculan con una búsqueda por documento en l10n_latam_invoice_document,
+            # fuera de la medición
+            moves.mapped('l10n_latam_available_document_type_ids')
+            self.env['account.journal'].invalidate_model()
+            self.env['ir.sequence'].invalidate_model()
+
+        prepare(small)
+        start = self.cr.sql_log_count
+        small._compute_l10n_latam_document_type()
+        small_count = self.cr.sql_log_count - start
+
+        prepare(large)
+        with self.assertQueryCount(small_count):
+            large._compute_l10n_latam_document_type()
+        self.assertEqual(set(large.mapped('l10n_latam_document_type_id')),
+                         set(small.mapped('l10n_latam_document_type_id')))
@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import BaseCase, tagged
+
+from odoo.addons.l10n_gt_inteligos.tools.amount_words import amount_to_words, amounts_to_words
+
+
+@tagged('post_install', '-at_install')
+class TestAmountWords(BaseCase):
+
+    def test_amount_to_words(self):
+        cases = [
+            (1250.5, 'mil doscientos cincuenta Quetzales con 50/100.'),
+            (21.01, 'veintiuno Quetzales con 01/100.'),
+            (100, 'cien Quetzales exactos.'),
+            (0.995, 'uno Quetzales exactos.'),
+            (-3.25, 'menos tres Quetzales con 25/100.'),
+        ]
+        for amount, words in cases:
+            with self.subTest(amount=amount):
+                self.assertEqual(amount_to_words(amount, currency_label='Quetzales'), words)
+
+    def test_empty_amount(self):
+        for amount in (None, False, 0, 0.0):
+            with self.subTest(amount=amount):
+                self.assertEqual(amount_to_words(amount, currency_label='Quetzales'), 'cero Quetzales exactos.')
+
+    def test_language_and_separator(self):
+        self.assertEqual(amount_to_words(12.5, lang='en_US', currency_label='Dollars', separator='and'),
+                         'twelve Dollars and con 50/100.')
+        # Un idioma sin equivalente en num2words utiliza ``language``
+        self.assertEqual(amount_to_words(12.5, lang='xx_XX'), 'doce con 50/100.')
+
+    def test_amounts_to_words(self):
+        amounts = [(1250.5, 'Quetzales', None, 'es_GT'), (None, 'Quetzales', None, 'es_GT'), (2, 'Dollars', 'and', 'en_US')]
+        self.assertEqual(amounts_to_words(amounts), [
+            'mil doscientos cincuenta Quetzales con 50/100.',
+            'cero Quetzales exactos.',
+            'two Dollars and exactos.',
+        ])
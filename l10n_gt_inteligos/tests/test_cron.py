@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+
+from unittest.mock import MagicMock, patch
+
+from odoo.tests import BaseCase, tagged
+
+from odoo.addons.l10n_gt_inteligos.tools import cron
+from odoo.addons.l10n_gt_inteligos.tools.cron import CronBatchRunner, default_time_limit
+
+
+@tagged('post_install', '-at_install')
+class TestCronBatchRunner(BaseCase):
+
+    def _runner(self, time_limit=60, auto_commit=True):
+        runner = CronBatchRunner(MagicMock(), 'l10n_gt_inteligos.ir_cron_test', time_limit)
+        runner.auto_commit = auto_commit
+        return runner
+
+    def test_commits_after_each_step(self):
+        runner = self._runner()
+        steps = iter([True, True, False])
+        self.assertTrue(runner.run(lambda: next(steps)))
+        self.assertEqual(runner.env.cr.commit.call_count, 3)
+        runner.env.ref.assert_not_called()
+
+    def test_retriggers_when_time_is_over(self):
+        runner = self._runner(time_limit=-1)
+        self.assertFalse(runner.run(lambda: True))
+        self.assertEqual(runner.env.cr.commit.call_count, 1)
+        runner.env.ref.assert_called_once_with('l10n_gt_inteligos.ir_cron_test')
+        runner.env.ref.return_value._trigger.assert_called_once_with()
+
+    def test_deadline_shared_between_runs(self):
+        runner = self._runner(time_limit=-1)
+        self.assertTrue(runner.run(lambda: False))
+        self.assertFalse(runner.run(lambda: True))
+
+    def test_no_commit_in_tests(self):
+        runner = self._runner(auto_commit=False)
+        steps = iter([True, False])
+        self.assertTrue(runner.run(lambda: next(steps)))
+        runner.env.cr.commit.assert_not_called()
+
+    def test_default_time_limit_from_config(self):
+        # La mitad del límite de tiempo real de los workers de cron, o del límite general si no está definido
+        with patch.dict(cron.config, {'limit_time_real': 120, 'limit_time_real_cron': -1}):
+            self.assertEqual(default_time_limit(), 60)
+        with patch.dict(cron.config, {'limit_time_real': 120, 'limit_time_real_cron': 300}):
+            self.assertEqual(default_time_limit(), 150)
+        with patch.dict(cron.config, {'limit_time_real': 120, 'limit_time_real_cron': 0}):
+            self.assertEqual(default_time_limit(), cron.DEFAULT_TIME_LIMIT)
@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+
+import socket
+import time
+from unittest.mock import patch
+
+from odoo.exceptions import ValidationError
+from odoo.tests import BaseCase, TransactionCase, tagged
+
+from odoo.addons.l10n_gt_inteligos.tests.common import FelStandInServer
+from odoo.addons.l10n_gt_inteligos.tools import fel_client
+from odoo.addons.l10n_gt_inteligos.tools.fel_client import (
+    CircuitBreaker, FelReceptorClient, FelServiceUnavailable, get_fel_client
+)
+
+ERROR = (503, {})
+
+
+@tagged('post_install', '-at_install')
+class TestFelReceptorClient(BaseCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FelStandInServer().start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        super().setUp()
+        self.server.responses.clear()
+        self.server.requests.clear()
+        self.server.connections = 0
+
+    def _client(self, **params):
+        params = dict({'url': self.server.url, 'retries': 2, 'backoff_factor': 0}, **params)
+        return FelReceptorClient(**params)
+
+    def test_pooled_session_reuses_connection(self):
+        client = self._client()
+        session = client.session
+        for nit in ('12345679', '576937K', '44444443'):
+            self.assertEqual(client.query_nit(nit)['nombre'], 'CONTRIBUYENTE,,DE PRUEBA')
+        self.assertIs(client.session, session)
+        self.assertEqual(self.server.connections, 1, "Las consultas deben reutilizar la conexión keep-alive")
+
+    def test_session_rebuilt_after_fork(self):
+        client = self._client()
+        session = client.session
+        with patch.object(fel_client.os, 'getpid', return_value=-1):
+            self.assertIsNot(client.session, session)
+
+    def test_retry_on_server_error(self):
+        self.server.responses['12345679'] = [ERROR, ERROR, (200, {'nombre': 'RECUPERADO', 'mensaje': ''})]
+        client = self._client()
+        self.assertEqual(client.query_nit('12345679')['nombre'], 'RECUPERADO')
+        self.assertEqual(self.server.requests, ['12345679'] * 3)
+        self.assertEqual(client.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_retries_exhausted(self):
+        self.server.responses['12345679'] = [ERROR]
+        client = self._client(retries=1)
+        with self.assertRaises(FelServiceUnavailable):
+            client.query_nit('12345679')
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(client.breaker.failures, 1)
+
+    def test_unreachable_service(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        client = FelReceptorClient(url='http://127.0.0.1:%s/rest/action' % port, retries=0, connect_timeout=0.5)
+        with self.assertRaises(FelServiceUnavailable):
+            client.query_nit('12345679')
+
+    def test_circuit_breaker_transitions(self):
+        self.server.responses['12345679'] = [ERROR, ERROR, (200, {'nombre': 'RECUPERADO', 'mensaje': ''})]
+        client = self._client(retries=0, failure_threshold=2, reset_timeout=0.1)
+        breaker = client.breaker
+
+        # CLOSED -> OPEN después de failure_threshold fallos consecutivos
+        for _i in range(2):
+            with self.assertRaises(FelServiceUnavailable):
+                client.query_nit('12345679')
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        # Con el circuito abierto la consulta falla sin llegar al servicio
+        with self.assertRaises(FelServiceUnavailable):
+            client.query_nit('12345679')
+        self.assertEqual(len(self.server.requests), 2)
+
+        # OPEN -> HALF_OPEN pasado reset_timeout, con una sola consulta de prueba a la vez
+        time.sleep(0.15)
+        self.assertTrue(breaker.allow_request())
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(breaker.allow_request())
+
+        # HALF_OPEN -> OPEN si la consulta de prueba falla, aun por debajo de failure_threshold
+        breaker.failures = 0
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+        # HALF_OPEN -> CLOSED si la consulta de prueba es exitosa
+        time.sleep(0.15)
+        self.assertEqual(client.query_nit('12345679')['nombre'], 'RECUPERADO')
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+    def test_shared_client_per_parameters(self):
+        client = get_fel_client(url=self.server.url, retries=0)
+        self.assertIs(get_fel_client(url=self.server.url, retries=0), client)
+        self.assertIsNot(get_fel_client(url=self.server.url, retries=1), client)
+
+
+@tagged('post_install', '-at_install')
+class TestFelLegalNameLookup(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FelStandInServer().start()
+        cls.addClassCleanup(cls.server.stop)
+        cls.env.company.account_fiscal_country_id = cls.env.ref('base.gt')
+        set_param = cls.env['ir.config_parameter'].sudo().set_param
+        set_param('l10n_gt_inteligos.fel_receptor_url', cls.server.url)
+        set_param('l10n_gt_inteligos.fel_retries', 0)
+        cls.partner_model = cls.env['res.partner']
+
+    def setUp(self):
+        super().setUp()
+        # Un cliente nuevo por prueba, para no arrastrar el estado del circuit breaker
+        fel_client._clients.clear()
+        self.server.responses.clear()
+        self.server.requests.clear()
+
+    def test_legal_name_from_service_is_cached(self):
+        self.server.responses['12345679'] = (200, {'nombre': 'PEREZ,,JUAN', 'mensaje': ''})
+        self.assertEqual(self.partner_model.search_legal_name_by_nit('1234567-9', 'Juan'), 'PEREZ JUAN')
+        self.assertEqual(self.partner_model.search_legal_name_by_nit('12345679', 'Juan'), 'PEREZ JUAN')
+        self.assertEqual(self.server.requests, ['12345679'])
+
+    def test_fallback_to_supplied_name_when_unavailable(self):
+        self.server.responses['576937K'] = [ERROR]
+        self.assertEqual(self.partner_model.search_legal_name_by_nit('576937-K', 'Nombre Ingresado'),
+                         'Nombre Ingresado')
+        # Un fallo del servicio no se guarda en la caché: la siguiente consulta vuelve a intentarlo
+        self.assertFalse(self.env['gt.nit.cache']._get_cached_result('576937K'))
+
+    def test_fallback_when_circuit_open(self):
+        self.server.responses['44444443'] = [ERROR]
+        for _i in range(5):
+            self.partner_model.search_legal_name_by_nit('44444443', 'Nombre')
+        requests_count = len(self.server.requests)
+        self.assertEqual(self.partner_model.search_legal_name_by_nit('44444443', 'Nombre'), 'Nombre')
+        self.assertEqual(len(self.server.requests), requests_count, "El circuito abierto no consulta el servicio")
+
+    def test_sat_message_raises(self):
+        self.server.responses['99996'] = (200, {'nombre': '', 'mensaje': 'NIT no existe'})
+        # Sin assertRaises, que revierte a un punto de guardado y descartaría el resultado guardado en la caché
+        try:
+            self.partner_model.search_legal_name_by_nit('99996', 'Nombre')
+        except ValidationError as e:
+            self.assertIn('NIT no existe', str(e))
+        else:
+            self.fail("Se esperaba un ValidationError")
+        self.assertEqual(self.env['gt.nit.cache']._get_cached_result('99996').error_message, 'NIT no existe')
+        # El resultado negativo en caché evita una segunda consulta
+        with self.assertRaisesRegex(ValidationError, 'NIT no existe'):
+            self.partner_model.search_legal_name_by_nit('99996', 'Nombre')
+        self.assertEqual(self.server.requests, ['99996'])
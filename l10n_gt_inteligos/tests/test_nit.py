@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+
+from odoo.exceptions import ValidationError
+from odoo.tests import BaseCase, TransactionCase, tagged
+
+from odoo.addons.l10n_gt_inteligos.tools.nit import is_valid_cui, is_valid_nit, normalize_nit, normalize_nit_sql
+
+VALID_NITS = ['12345679', '1234567-9', '576937K', '576937-k', '44444443', '9999-6', '100-7', ' 1234567 9 ']
+INVALID_NITS = ['12345671', '576937-1', '4444444K', '99990', '', 'K', '12A4567-9', '1234567-99', '1' * 14 + '6']
+VALID_CUIS = [
+    '1234567890101', '3010255762217', '1500000061230', '1234 56789 0101',
+    '2345678990514',  # Sipacate, Escuintla
+    '3456789071333',  # Petatán, Huehuetenango
+]
+INVALID_CUIS = [
+    '1234567800101',  # dígito verificador
+    '1234567892301',  # departamento 23 inexistente
+    '1234567890100',  # municipio 00
+    '3010255762218',  # municipio 18 fuera del rango del departamento 22
+    '2345678990515',  # municipio 15 fuera del rango de Escuintla
+    '3456789071334',  # municipio 34 fuera del rango de Huehuetenango
+    '123456789010',  # longitud
+    '12345678901A1',
+]
+
+
+@tagged('post_install', '-at_install')
+class TestNitTools(BaseCase):
+
+    def test_normalize_nit(self):
+        self.assertEqual(normalize_nit(' 123.456-k\t'), '123456K')
+        self.assertEqual(normalize_nit(None), '')
+        self.assertEqual(normalize_nit_sql('vat'), "NULLIF(UPPER(TRANSLATE(vat, E'- .\\t', '')), '')")
+
+    def test_valid_nits(self):
+        for nit in VALID_NITS:
+            with self.subTest(nit=nit):
+                self.assertTrue(is_valid_nit(nit))
+
+    def test_invalid_nits(self):
+        for nit in INVALID_NITS:
+            with self.subTest(nit=nit):
+                self.assertFalse(is_valid_nit(nit))
+
+    def test_valid_cuis(self):
+        for cui in VALID_CUIS:
+            with self.subTest(cui=cui):
+                self.assertTrue(is_valid_cui(cui))
+                self.assertTrue(is_valid_nit(cui), "La SAT admite el CUI como NIT")
+                self.assertFalse(is_valid_nit(cui, allow_cui=False))
+
+    def test_invalid_cuis(self):
+        for cui in INVALID_CUIS:
+            with self.subTest(cui=cui):
+                self.assertFalse(is_valid_cui(cui))
+
+
+@tagged('post_install', '-at_install')
+class TestPartnerNitConstraint(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.env.company.account_fiscal_country_id = cls.env.ref('base.gt')
+        # no_vat_validation: sólo se prueba la validación local del módulo, no la de base_vat
+        cls.partner_model = cls.env['res.partner'].with_context(test_vat=True, no_vat_validation=True)
+        cls.country_gt = cls.env.ref('base.gt')
+
+    def test_valid_nit_is_normalized(self):
+        partner = self.partner_model.create({'name': 'Contacto', 'vat': '576937-k', 'country_id': self.country_gt.id})
+        self.assertEqual(partner.vat, '576937K')
+
+    def test_invalid_nit_is_rejected(self):
+        with self.assertRaisesRegex(ValidationError, 'dígito verificador'):
+            self.partner_model.create({'name': 'Contacto', 'vat': '1234567-1', 'country_id': self.country_gt.id})
+
+    def test_cui_identification_type(self):
+        cui_type = self.env.ref('l10n_gt_inteligos.it_cui')
+        self.partner_model.create({'name': 'Persona', 'vat': VALID_CUIS[0], 'country_id': self.country_gt.id,
+                                   'l10n_latam_identification_type_id': cui_type.id})
+        with self.assertRaisesRegex(ValidationError, 'CUI'):
+            self.partner_model.create({'name': 'Persona', 'vat': INVALID_CUIS[0], 'country_id': self.country_gt.id,
+                                       'l10n_latam_identification_type_id': cui_type.id})
+
+    def test_duplicate_nit(self):
+        vals = {'name': 'Contacto', 'vat': '12345679', 'company_id': self.env.company.id}
+        self.partner_model.create(dict(vals, country_id=self.country_gt.id))
+        self.partner_model.create(dict(vals, country_id=self.country_gt.id, legal_name='Otra razón social'))
+        with self.assertRaisesRegex(ValidationError, '12345679'):
+            self.partner_model.create(dict(vals, country_id=self.country_gt.id))
+
+    def test_duplicate_nit_without_country(self):
+        vals = {'name': 'Contacto', 'vat': '576937K', 'company_id': self.env.company.id}
+        self.partner_model.create(vals)
+        self.partner_model.create(dict(vals, country_id=self.country_gt.id))
+        with self.assertRaisesRegex(ValidationError, '576937K'):
+            self.partner_model.create(vals)
+
+    def test_nit_search_substring(self):
+        partner = self.partner_model.create({'name': 'Contacto', 'vat': '576937-K', 'country_id': self.country_gt.id})
+        for operator, value in [('ilike', '6937'), ('ilike', '937-k'), ('like', '5769'), ('=', '576937-k'),
+                                ('=like', '5769%')]:
+            with self.subTest(operator=operator, value=value):
+                self.assertIn(partner, self.partner_model.search([('nit_search', operator, value)]))
+        self.assertNotIn(partner, self.partner_model.search([('nit_search', '=', '6937')]))
+        self.assertNotIn(partner, self.partner_model.search([('nit_search', '=like', '6937%')]))
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+from odoo.tests import TransactionCase, tagged
+
+from odoo.addons.l10n_gt_inteligos.tests.common import FelStandInServer
+from odoo.addons.l10n_gt_inteligos.tools import fel_client
+from odoo.addons.l10n_gt_inteligos.tools.nit import _nit_check_digit
+
+
+def make_nit(body):
+    return '%s-%s' % (body, _nit_check_digit(str(body)))
+
+
+@tagged('post_install', '-at_install')
+class TestVerifyNitsBatch(TransactionCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = FelStandInServer().start()
+        cls.addClassCleanup(cls.server.stop)
+        cls.env.company.account_fiscal_country_id = cls.env.ref('base.gt')
+        cls.country_gt = cls.env.ref('base.gt')
+        set_param = cls.env['ir.config_parameter'].sudo().set_param
+        set_param('l10n_gt_inteligos.fel_receptor_url', cls.server.url)
+        set_param('l10n_gt_inteligos.fel_retries', 0)
+
+    def setUp(self):
+        super().setUp()
+        fel_client._clients.clear()
+        self.server.responses.clear()
+        self.server.requests.clear()
+
+    def _create_partners(self, vats):
+        return self.env['res.partner'].create([
+            {'name': 'Contacto %s' % index, 'vat': vat, 'country_id': self.country_gt.id}
+            for index, vat in enumerate(vats)
+        ])
+
+    def test_duplicated_nits_are_queried_once(self):
+        self.server.responses['12345679'] = (200, {'nombre': 'PEREZ,,JUAN', 'mensaje': ''})
+        partners = self._create_partners(['1234567-9', '12345679', '1234567 9'])
+        summary = self.env['res.partner'].verify_nits_batch(partners.ids)
+        self.assertEqual(self.server.requests, ['12345679'])
+        self.assertEqual((summary['partners'], summary['nits'], summary['queried']), (3, 1, 1))
+        self.assertEqual(set(partners.mapped('legal_name')), {'PEREZ JUAN'})
+        self.assertTrue(all(partners.mapped('nit_verification_date')))
+
+    def test_concurrent_lookups(self):
+        vats = [make_nit(1000000 + index) for index in range(40)]
+        partners = self._create_partners(vats)
+        summary = self.env['res.partner'].verify_nits_batch(partners.ids, max_workers=8)
+        self.assertEqual(sorted(self.server.requests), sorted(vat.replace('-', '') for vat in vats))
+        self.assertEqual(summary['verified'], 40)
+        self.assertFalse(summary['failed'])
+        self.assertEqual(set(partners.mapped('legal_name')), {'CONTRIBUYENTE DE PRUEBA'})
+
+    def test_invalid_and_cached_nits_are_not_queried(self):
+        self.env['gt.nit.cache']._store_result('576937K', legal_name='EN CACHE')
+        partners = self._create_partners(['576937-K', '1234567-1'])
+        summary = self.env['res.partner'].verify_nits_batch(partners.ids)
+        self.assertFalse(self.server.requests)
+        self.assertEqual(summary['cached'], 1)
+        self.assertEqual(partners[0].legal_name, 'EN CACHE')
+        self.assertIn('12345671', summary['invalid'])
+        self.assertTrue(partners[1].nit_verification_error)
+
+    def test_sat_message_is_stored_as_error(self):
+        self.server.responses['44444443'] = (200, {'nombre': '', 'mensaje': 'NIT no existe'})
+        partner = self._create_partners(['4444444-3'])
+        self.env['res.partner'].verify_nits_batch(partner.ids)
+        self.assertEqual(partner.nit_verification_error, 'NIT no existe')
+        self.assertTrue(partner.nit_verification_date)
+        self.assertEqual(self.env['gt.nit.cache']._get_cached_result('44444443').error_message, 'NIT no existe')
+
+    def test_failures_stay_pending_for_next_run(self):
+        self.server.responses['99996'] = [(503, {})]
+        partners = self._create_partners(['9999-6', '1234567-9'])
+        summary = self.env['res.partner'].verify_nits_batch(partners.ids)
+        self.assertIn('99996', summary['failed'])
+        self.assertFalse(partners[0].nit_verification_date, "Un NIT sin respuesta queda pendiente")
+        self.assertTrue(partners[1].nit_verification_date)
+        self.assertFalse(self.env['gt.nit.cache']._get_cached_result('99996'))
+
+        # La siguiente ejecución de la acción planificada verifica el NIT pendiente
+        self.server.responses['99996'] = (200, {'nombre': 'RECUPERADO', 'mensaje': ''})
+        self.env['res.partner']._cron_verify_nits()
+        self.assertTrue(partners[0].nit_verification_date)
+        self.assertEqual(partners[0].legal_name, 'RECUPERADO')
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""Conversión de montos a letras compartida por facturas y pagos, ej. 1250.5 ->
+    'mil doscientos cincuenta quetzales con 50/100.'
+"""
+
+from functools import lru_cache
+
+from num2words import num2words
+
+# Idioma de Odoo -> código de idioma de num2words
+NUM2WORDS_LANG = {
+    'en_US': 'en', 'en_AU': 'en', 'en_GB': 'en', 'en_IN': 'en',
+    'fr_BE': 'fr', 'fr_CA': 'fr', 'fr_CH': 'fr', 'fr_FR': 'fr',
+    'es_ES': 'es', 'es_AR': 'es', 'es_BO': 'es', 'es_CL': 'es', 'es_CO': 'es', 'es_CR': 'es', 'es_DO': 'es',
+    'es_EC': 'es', 'es_GT': 'es', 'es_MX': 'es', 'es_PA': 'es', 'es_PE': 'es', 'es_PY': 'es', 'es_UY': 'es',
+    'es_VE': 'es',
+    'lt_LT': 'lt', 'lv_LV': 'lv', 'nb_NO': 'no', 'pl_PL': 'pl', 'ru_RU': 'ru',
+    'da_DK': 'dk', 'pt_BR': 'pt_BR', 'de_DE': 'de', 'de_CH': 'de',
+    'ar_SY': 'ar', 'it_IT': 'it', 'he_IL': 'he', 'id_ID': 'id', 'tr_TR': 'tr',
+    'nl_NL': 'nl', 'nl_BE': 'nl', 'uk_UA': 'uk', 'sl_SI': 'sl', 'vi_VN': 'vi_VN',
+}
+
+
+@lru_cache(maxsize=65536)
+def integer_to_words(value, language):
+    """Parte entera en letras; los montos de facturas y pagos se repiten mucho, por lo que se memoriza."""
+    return num2words(value, lang=language)
+
+
+def amount_to_words(amount, language='es', currency_label=None, separator=None, lang=None):
+    """
+    Convierte un monto en letras.
+    :param amount: int or float monto; None o False se consideran 0
+    :param language: str código num2words a utilizar si ``lang`` no está en NUM2WORDS_LANG
+    :param currency_label: str nombre de la moneda, ej. 'Quetzales'
+    :param separator: str separador entre la moneda y los centavos
+    :param lang: str idioma de Odoo, ej. 'es_GT'
+    :return: str monto en letras, con los centavos como fracción de 100
+    """
+    amount = amount or 0.0
+    language = NUM2WORDS_LANG.get(lang, language)
+    cents = round(abs(amount) * 100)
+    integer = cents // 100
+    decimals = cents % 100
+
+    words = integer_to_words(-integer if amount < 0 else integer, language)
+    if currency_label:
+        words += ' ' + currency_label
+    if separator:
+        words += ' ' + separator
+    if decimals:
+        return '%s con %02d/100.' % (words, decimals)
+    return words + ' exactos.'
+
+
+def amounts_to_words(amounts, language='es'):
+    """
+    Forma por lotes de amount_to_words, para cómputos y reportes sobre muchos documentos.
+    :param amounts: iterable of tuple (monto, nombre de la moneda, separador, idioma de Odoo)
+    :return: list of str en el mismo orden de ``amounts``
+    """
+    return [
+        amount_to_words(amount, language, currency_label, separator, lang)
+        for amount, currency_label, separator, lang in amounts
+    ]
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""Ejecución por lotes de las acciones planificadas del módulo (recálculos, cargas históricas, publicación masiva)."""
+
+import threading
+import time
+
+from odoo.tools import config
+
+# Presupuesto sin límite de tiempo real configurado
+DEFAULT_TIME_LIMIT = 90
+
+
+def default_time_limit():
+    """
+    Presupuesto de tiempo por ejecución: la mitad del límite de tiempo real de los workers de acciones planificadas
+    (limit_time_real_cron o, si no está definido, limit_time_real), para volver a programarse antes de que el
+    worker sea terminado a mitad de un paso.
+    :return: float segundos
+    """
+    limit = config.get('limit_time_real_cron', -1)
+    if limit is None or limit < 0:
+        limit = config.get('limit_time_real', 120)
+    return limit / 2 if limit else DEFAULT_TIME_LIMIT
+
+
+class CronBatchRunner:
+    """Ejecuta pasos de una acción planificada confirmando la transacción después de cada paso.
+
+        Si se agota ``time_limit`` (por defecto default_time_limit) la acción planificada ``cron_xmlid`` se vuelve
+        a programar de inmediato para continuar en una nueva ejecución, en lugar de exceder el límite de tiempo del
+        worker. El mismo runner puede ejecutar varios trabajos con un único plazo. Dentro de las pruebas no se
+        confirma la transacción.
+    """
+
+    def __init__(self, env, cron_xmlid, time_limit=None):
+        self.env = env
+        self.cron_xmlid = cron_xmlid
+        self.deadline = time.monotonic() + (default_time_limit() if time_limit is None else time_limit)
+        self.auto_commit = not getattr(threading.current_thread(), 'testing', False)
+
+    def commit(self):
+        if self.auto_commit:
+            self.env.cr.commit()
+
+    def run(self, step):
+        """
+        Ejecuta ``step`` hasta que no quede trabajo pendiente o se agote el tiempo.
+        :param step: callable sin argumentos que procesa un lote y devuelve bool True si queda trabajo pendiente
+        :return: bool True si el trabajo finalizó, False si se agotó el tiempo y se volvió a programar
+        """
+        while step():
+            self.commit()
+            if time.monotonic() > self.deadline:
+                self.env.ref(self.cron_xmlid)._trigger()
+                return False
+        self.commit()
+        return True
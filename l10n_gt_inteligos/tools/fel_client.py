@@ -0,0 +1,154 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_logger = logging.getLogger(__name__)
+
+FEL_RECEPTOR_URL = 'https://consultareceptores.feel.com.gt/rest/action'
+
+
+class FelServiceUnavailable(Exception):
+    """El servicio FEL no respondió correctamente o el circuito se encuentra abierto."""
+
+
+class CircuitBreaker:
+    """Circuit breaker simple para el servicio FEL.
+
+        Después de ``failure_threshold`` fallos consecutivos el circuito se abre y las consultas fallan
+        de inmediato durante ``reset_timeout`` segundos. Pasado ese tiempo se permite una consulta de
+        prueba (half-open): si es exitosa el circuito se cierra, en otro caso se vuelve a abrir.
+    """
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def allow_request(self):
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                # Sólo una consulta de prueba a la vez
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    _logger.warning("FEL circuit breaker opened after %s failures", self.failures)
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+
+
+class FelReceptorClient:
+    """Cliente HTTP para el servicio de consulta de receptores FEL.
+
+        Mantiene una sesión ``requests`` con pool de conexiones keep-alive por proceso (worker),
+        timeouts de conexión/lectura, reintentos acotados con backoff exponencial y un circuit breaker.
+    """
+
+    def __init__(self, url=FEL_RECEPTOR_URL, emisor_codigo=None, emisor_clave=None,
+                 connect_timeout=3.05, read_timeout=10.0, retries=2, backoff_factor=0.3,
+                 pool_size=10, failure_threshold=5, reset_timeout=30.0):
+        self.url = url
+        self.emisor_codigo = emisor_codigo
+        self.emisor_clave = emisor_clave
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self._session = None
+        self._session_pid = None
+        self._lock = threading.Lock()
+
+    def _build_session(self):
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['POST']),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.headers.update({'Content-Type': 'application/json'})
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    @property
+    def session(self):
+        # Las conexiones no deben compartirse entre procesos después de un fork (modo prefork)
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    self._session = self._build_session()
+                    self._session_pid = pid
+        return self._session
+
+    def query_nit(self, nit):
+        """
+        Consulta un NIT en el servicio de receptores FEL.
+        :param nit: str NIT sin guiones
+        :return: dict con la respuesta del servicio ('nombre', 'mensaje', ...)
+        :raise FelServiceUnavailable: si el circuito está abierto o el servicio no respondió correctamente
+        """
+        if not self.breaker.allow_request():
+            raise FelServiceUnavailable("El servicio de consulta de NIT de la SAT no está disponible.")
+        data = {
+            "emisor_codigo": self.emisor_codigo,
+            "emisor_clave": self.emisor_clave,
+            "nit_consulta": nit,
+        }
+        try:
+            resp = self.session.post(url=self.url, json=data, timeout=self.timeout)
+            resp.raise_for_status()
+            result = resp.json()
+        except (requests.RequestException, ValueError) as e:
+            self.breaker.record_failure()
+            _logger.warning("FEL receptor query failed for NIT %s: %s", nit, e)
+            raise FelServiceUnavailable("El servicio de consulta de NIT de la SAT no está disponible.") from e
+        self.breaker.record_success()
+        return result
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_fel_client(**params):
+    """Devuelve el cliente compartido del proceso para los parámetros indicados.
+        Un cambio de parámetros genera un nuevo cliente, con su propio pool y circuit breaker."""
+    key = tuple(sorted(params.items()))
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = FelReceptorClient(**params)
+    return client
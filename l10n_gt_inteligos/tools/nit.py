@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Validación local de NIT y CUI de Guatemala, sin dependencias del ORM.
+
+    NIT: dígitos seguidos de un dígito verificador (0-9 o K) calculado con módulo 11.
+    CUI: 13 dígitos, 8 de correlativo, 1 verificador (módulo 11), 2 de departamento y 2 de municipio.
+"""
+
+import re
+
+_NIT_RE = re.compile(r'^\d{1,12}[\dK]$')
+_CUI_RE = re.compile(r'^\d{13}$')
+_STRIP_TABLE = str.maketrans('', '', '- .\t')
+_DIGITS = {str(d): d for d in range(10)}
+
+# Cantidad de municipios por departamento, en el orden del código de departamento (01-22).
+# Escuintla (05) incluye Sipacate (0514) y Huehuetenango (13) incluye Petatán (1333).
+_COUNTIES_BY_STATE = (17, 8, 16, 16, 14, 14, 19, 8, 24, 21, 9, 30, 33, 21, 8, 17, 14, 5, 11, 11, 7, 17)
+
+
+def normalize_nit_sql(column):
+    """Expresión SQL equivalente a normalize_nit para la columna indicada."""
+    return "NULLIF(UPPER(TRANSLATE(%s, E'- .\\t', '')), '')" % column
+
+
+def normalize_nit(value):
+    """Devuelve el NIT sin guiones, espacios ni puntos y en mayúsculas, ej. '123456-k' -> '123456K'."""
+    return (value or '').translate(_STRIP_TABLE).upper()
+
+
+def _nit_check_digit(body):
+    total = 0
+    weight = 2
+    for char in reversed(body):
+        total += _DIGITS[char] * weight
+        weight += 1
+    check = (11 - total % 11) % 11
+    return 'K' if check == 10 else str(check)
+
+
+def is_valid_cui(value):
+    """Valida un CUI/DPI normalizado o no normalizado."""
+    cui = normalize_nit(value)
+    if not _CUI_RE.match(cui):
+        return False
+    state, county = int(cui[9:11]), int(cui[11:13])
+    if not 1 <= state <= len(_COUNTIES_BY_STATE) or not 1 <= county <= _COUNTIES_BY_STATE[state - 1]:
+        return False
+    total = sum(_DIGITS[char] * weight for weight, char in enumerate(cui[:8], start=2))
+    return total % 11 == _DIGITS[cui[8]]
+
+
+def is_valid_nit(value, allow_cui=True):
+    """
+    Valida el dígito verificador de un NIT.
+    :param value: str NIT, con o sin guiones
+    :param allow_cui: bool aceptar también un CUI válido, ya que la SAT lo admite como NIT
+    :return: bool
+    """
+    nit = normalize_nit(value)
+    if _NIT_RE.match(nit) and _nit_check_digit(nit[:-1]) == nit[-1]:
+        return True
+    return allow_cui and is_valid_cui(nit)
+
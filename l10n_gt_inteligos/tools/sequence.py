@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+"""Análisis de las expresiones regulares de numeración de sequence.mixin (_sequence_*_regex)."""
+
+import re
+from functools import lru_cache
+
+SEQUENCE_PLACEHOLDER_RE = re.compile(r'\b(prefix\d|seq|suffix\d?|year|year_end|month)\b')
+
+
+@lru_cache(maxsize=64)
+def parse_sequence_regex(regex):
+    """
+    Patrón compilado y formato de nombre para una expresión regular de secuencia. Las expresiones son constantes de
+    clase (_sequence_*_regex), por lo que se analizan una sola vez por proceso.
+    :param regex: str expresión regular con grupos nombrados prefix1, seq, year, etc.
+    :return: tuple (patrón compilado, str formato para str.format)
+    """
+    format = ''.join(
+        "{seq:0{seq_length}d}" if s == 'seq' else
+        "{month:02d}" if s == 'month' else
+        "{year:0{year_length}d}" if s == 'year' else
+        "{year_end:0{year_end_length}d}" if s == 'year_end' else
+        "{%s}" % s
+        for s in SEQUENCE_PLACEHOLDER_RE.findall(regex)
+    )
+    return re.compile(regex), format